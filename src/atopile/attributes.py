@@ -4,6 +4,7 @@ This file defines what attributes are available in `ato`.
 
 import logging
 import re
+from collections import defaultdict
 from typing import Type
 
 import faebryk.core.parameter as fab_param
@@ -19,11 +20,16 @@ log = logging.getLogger(__name__)
 
 
 shim_map: dict[address.AddrStr, tuple[Type[L.Node], str]] = {}
+# Shim addresses indexed by their entry section, so finding a shim for a ref
+# only needs to check the handful of addresses ending in that same ref
+shim_addrs_by_entry = defaultdict[str | None, list[address.AddrStr]](list)
 
 
 def _register_shim(addr: str | address.AddrStr, preferred: str):
     def _wrapper[T: Type[L.Node]](cls: T) -> T:
-        shim_map[address.AddrStr(addr)] = cls, preferred
+        addr_ = address.AddrStr(addr)
+        shim_map[addr_] = cls, preferred
+        shim_addrs_by_entry[address.get_entry_section(addr_)].append(addr_)
         return cls
 
     return _wrapper
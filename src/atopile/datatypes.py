@@ -3,6 +3,7 @@ Datatypes used in the model.
 """
 
 import logging
+import sys
 from contextlib import contextmanager
 from typing import Iterable, Iterator, Self
 
@@ -52,11 +53,34 @@ KeyType = str | int
 
 
 class ReferencePartType:
+    """
+    Immutable, and compared by value, so it can be used as a dict / set key
+    """
+
+    __slots__ = ("_name", "_key", "_hash")
+
     def __init__(self, name: str, key: KeyType | None = None):
         # TODO remove
         assert isinstance(name, str)
-        self.name = name
-        self.key = key
+        self._name = sys.intern(name)
+        self._key = key
+        self._hash = hash((self._name, key))
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def key(self) -> KeyType | None:
+        return self._key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ReferencePartType):
+            return NotImplemented
+        return self._name == other._name and self._key == other._key
 
     def __str__(self) -> str:
         if self.key is not None:
@@ -76,7 +100,6 @@ class FieldRef:
     def __init__(
         self, parts: Iterable[ReferencePartType], pin: int | str | None = None
     ):
-        self.parts = list(parts)
         # shim A.1
         if pin is not None:
             ref = None
@@ -85,7 +108,9 @@ class FieldRef:
             else:
                 # TODO: consider shiming A.0 as A.pins[0] instead of A._0
                 ref = ReferencePartType(f"_{pin}")
-            self.parts.append(ref)
+            parts = (*parts, ref)
+
+        self.parts = tuple(parts)
 
     def __iter__(self) -> Iterator[ReferencePartType]:
         return iter(self.parts)
@@ -111,7 +136,7 @@ class FieldRef:
         return self.parts[-1]
 
     def append(self, part: ReferencePartType) -> Self:
-        return type(self)(self.parts + [part])
+        return type(self)((*self.parts, part))
 
     def __str__(self) -> str:
         return ".".join(str(part) for part in self.parts)
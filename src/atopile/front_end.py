@@ -2,16 +2,17 @@
 Build faebryk core objects from ato DSL.
 """
 
+import functools
 import inspect
 import itertools
 import logging
 import operator
 import os
+import sys
 from collections import defaultdict
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from contextlib import contextmanager
 from dataclasses import dataclass
-from itertools import chain, pairwise
 from pathlib import Path
 from typing import (
     Any,
@@ -20,6 +21,7 @@ from typing import (
     Type,
     cast,
 )
+from weakref import WeakKeyDictionary
 
 from antlr4 import ParserRuleContext
 from more_itertools import last
@@ -28,12 +30,18 @@ from pint import UndefinedUnitError
 import faebryk.library._F as F
 import faebryk.libs.library.L as L
 from atopile import address, errors
-from atopile.attributes import GlobalAttributes, _has_ato_cmp_attrs, shim_map
+from atopile.attributes import (
+    GlobalAttributes,
+    _has_ato_cmp_attrs,
+    shim_addrs_by_entry,
+    shim_map,
+)
 from atopile.config import config
 from atopile.datatypes import (
     FieldRef,
     KeyOptItem,
     KeyOptMap,
+    KeyType,
     ReferencePartType,
     StackList,
     TypeRef,
@@ -71,15 +79,11 @@ from faebryk.libs.units import (
     Unit as UnitType,
 )
 from faebryk.libs.util import (
-    FuncDict,
-    cast_assert,
-    groupby,
-    has_attr_or_property,
     has_instance_settable_attr,
     import_from_path,
     is_type_pair,
     not_none,
-    partition_as_list,
+    once,
 )
 
 logger = logging.getLogger(__name__)
@@ -94,22 +98,106 @@ class from_dsl(Trait.decless()):
         self.src_ctx = src_ctx
 
 
+_ctx_text_cache = WeakKeyDictionary[ParserRuleContext, str]()
+
+
+def _get_text(ctx: ParserRuleContext) -> str:
+    """
+    Cached `ctx.getText()`
+
+    `getText` walks and joins all the tokens under the ctx, and the same
+    ctxs are visited many times over (by Wendy, then Bob for every build)
+
+    Names are used all over as (parts of) dict keys, so they're interned as
+    they're cached
+    """
+    try:
+        return _ctx_text_cache[ctx]
+    except KeyError:
+        text = ctx.getText()
+        if isinstance(ctx, ap.NameContext):
+            text = sys.intern(text)
+        _ctx_text_cache[ctx] = text
+        return text
+
+
+_BOOLEANS = {"True": True, "true": True, "False": False, "false": False}
+
+# Settable properties of GlobalAttributes, including inherited ones
+_GLOBAL_ATTRIBUTE_SETTERS: dict[str, property] = {
+    name: prop
+    for name in dir(GlobalAttributes)
+    if isinstance(prop := getattr(GlobalAttributes, name, None), property)
+    and prop.fset
+}
+
+_COMPARISON_OPS: dict[str, type[ConstrainableExpression]] = {
+    "<=": LessOrEqual,
+    ">=": GreaterOrEqual,
+    "within": IsSubset,
+    "is": Is,
+}
+
+# Strict comparisons are accepted as their non-strict counterparts, with a warning
+_DEPRECATED_COMPARISON_OPS: dict[str, tuple[str, type[ConstrainableExpression]]] = {
+    "<": ("<=", LessOrEqual),
+    ">": (">=", GreaterOrEqual),
+}
+
+# Opcodes for compiled arithmetic, see `Bob._evaluate_arithmetic`
+_OP_CONST = 0  # push the arg
+_OP_PARAM = 1  # push the param at the (FieldRef, ctx) arg
+_OP_BINARY = 2  # pop two operands, push the arg applied to them
+_OP_CALL = 3  # pop the arg's count of operands, push its function applied to them
+type _Instruction = tuple[int, Any]
+
+
+def _emit_binary(program: list[_Instruction], op: Callable[[Any, Any], Any]):
+    """
+    Append a binary operation to a program, folding it into a constant if
+    both its operands are constants
+    """
+    if len(program) >= 2 and program[-1][0] == _OP_CONST == program[-2][0]:
+        value = op(program[-2][1], program[-1][1])
+        # Nodes can only live in one place in the graph, so mustn't be shared
+        if not isinstance(value, L.Node):
+            program[-2:] = [(_OP_CONST, value)]
+            return
+
+    program.append((_OP_BINARY, op))
+
+
+@once
+def _get_unit(unit_str: str) -> UnitType:
+    """`P.Unit`, cached since the same handful of units are used everywhere"""
+    return P.Unit(unit_str)
+
+
+# Blocktypes are a single keyword token, so dispatch on its token type
+_BASE_CLASS_BY_BLOCKTYPE: dict[int, Type[L.Node]] = {
+    ap.INTERFACE: L.ModuleInterface,
+    ap.COMPONENT: L.Module,
+    ap.MODULE: L.Module,
+}
+
+
 class BasicsMixin:
     def visitName(self, ctx: ap.NameContext) -> str:
         """
         If this is an int, convert it to one (for pins),
         else return the name as a string.
         """
-        return ctx.getText()
+        # Interned by `_get_text`
+        return _get_text(ctx)
 
     def visitTypeReference(self, ctx: ap.Type_referenceContext) -> TypeRef:
-        return TypeRef(self.visitName(name) for name in ctx.name())
+        return TypeRef([self.visitName(name) for name in ctx.name()])
 
     def visitArrayIndex(self, ctx: ap.Array_indexContext | None) -> str | int | None:
         if ctx is None:
             return None
         if key := ctx.key():
-            out = key.getText()
+            out = _get_text(key)
             if is_int(out):
                 return int(out)
             return out
@@ -125,26 +213,28 @@ class BasicsMixin:
     def visitFieldReference(self, ctx: ap.Field_referenceContext) -> FieldRef:
         pin = ctx.pin_reference_end()
         if pin is not None:
-            pin = int(pin.NUMBER().getText())
+            # A single token, so its text is already at hand - no need to cache
+            pin = int(pin.NUMBER().symbol.text)
         return FieldRef(
-            parts=(
+            parts=[
                 self.visitFieldReferencePart(part)
                 for part in ctx.field_reference_part()
-            ),
+            ],
             pin=pin,
         )
 
     def visitString(self, ctx: ap.StringContext) -> str:
-        raw: str = ctx.getText()
+        raw: str = _get_text(ctx)
         return raw.strip("\"'")
 
     def visitBoolean_(self, ctx: ap.Boolean_Context) -> bool:
-        raw: str = ctx.getText()
+        raw: str = _get_text(ctx)
 
-        if raw.lower() == "true":
-            return True
-        elif raw.lower() == "false":
-            return False
+        # The grammar only allows "True" and "False", so this is the fast path
+        if (value := _BOOLEANS.get(raw)) is not None:
+            return value
+        if (value := _BOOLEANS.get(raw.lower())) is not None:
+            return value
 
         raise errors.UserException.from_ctx(ctx, f"Expected a boolean value, got {raw}")
 
@@ -153,6 +243,42 @@ class NOTHING:
     """A sentinel object to represent a "nothing" return value."""
 
 
+_MISSING = object()
+_NO_FAILURES: frozenset[str] = frozenset()
+
+
+# Weakly keyed, since ato classes are created per build and mustn't be pinned
+_class_property_cache = WeakKeyDictionary[type, dict[str, bool]]()
+
+
+def _is_class_property(cls: type, name: str) -> bool:
+    """Whether `name` is a property on `cls`. Cached, since classes are static."""
+    try:
+        by_name = _class_property_cache[cls]
+    except KeyError:
+        by_name = _class_property_cache[cls] = {}
+    try:
+        return by_name[name]
+    except KeyError:
+        result = by_name[name] = isinstance(getattr(cls, name, None), property)
+        return result
+
+
+def _friendly_ref_name(ref: ReferencePartType) -> str:
+    return ref.name if ref.key is None else f"{ref.name}[{ref.key}]"
+
+
+def _getattr_or_property(obj: object, name: str) -> Any:
+    """
+    `getattr` with a `_MISSING` default, except that properties raising
+    AttributeError (eg. write-only ones) are allowed to do so
+    """
+    result = getattr(obj, name, _MISSING)
+    if result is _MISSING and _is_class_property(type(obj), name):
+        return getattr(obj, name)
+    return result
+
+
 class SkipPriorFailedException(Exception):
     """Raised to skip a statement in case a dependency already failed"""
 
@@ -197,18 +323,29 @@ class SequenceMixin:
                 with err_cltr():
                     # Since we're in a SequenceMixin, we need to cast self to the visitor type # noqa: E501  # pre-existing
                     child_result = cast(AtoParserVisitor, self).visit(child)
-                    if child_result is not NOTHING:
-                        yield child_result
-
-        child_results = chain.from_iterable(_visit())
-        child_results = filter(lambda x: x is not NOTHING, child_results)
-        child_results = KeyOptMap(KeyOptItem(cr) for cr in child_results)
+                    if child_result is NOTHING:
+                        continue
+                    for item in child_result:
+                        if item is not NOTHING:
+                            yield KeyOptItem(item)
 
-        return KeyOptMap(child_results)
+        return KeyOptMap(_visit())
 
     def visitFile_input(self, ctx: ap.File_inputContext) -> KeyOptMap:
         return self.visit_iterable_helper(ctx.stmt())
 
+    # The following rules always have exactly one child, so dispatch straight
+    # to it rather than through the generic `visitChildren` aggregation loop
+
+    def visitStmt(self, ctx: ap.StmtContext):
+        return ctx.getChild(0).accept(self)
+
+    def visitSimple_stmt(self, ctx: ap.Simple_stmtContext):
+        return ctx.getChild(0).accept(self)
+
+    def visitCompound_stmt(self, ctx: ap.Compound_stmtContext):
+        return ctx.getChild(0).accept(self)
+
     def visitSimple_stmts(self, ctx: ap.Simple_stmtsContext) -> KeyOptMap:
         return self.visit_iterable_helper(ctx.simple_stmt())
 
@@ -227,11 +364,21 @@ class BlockNotFoundError(errors.UserKeyError):
     """
 
 
-@dataclass
+@once
+def _get_stdlib_nodes() -> dict[str, Type[L.Module | L.ModuleInterface]]:
+    """Modules and interfaces importable from the standard library, by name"""
+    return {
+        name: obj
+        for name, obj in vars(F).items()
+        if isinstance(obj, type) and issubclass(obj, (L.Module, L.ModuleInterface))
+    }
+
+
+@dataclass(slots=True)
 class Context:
     """~A metaclass to hold context/origin information on ato classes."""
 
-    @dataclass
+    @dataclass(slots=True)
     class ImportPlaceholder:
         ref: TypeRef
         from_path: str
@@ -258,6 +405,20 @@ class Wendy(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Ov
     Wendy also knows where to find the best building supplies.
     """
 
+    @staticmethod
+    def _may_declare(ctx: ap.StmtContext) -> bool:
+        """Whether a statement could declare a ref (an import or blockdef)."""
+        if ctx.compound_stmt():
+            return True
+        return any(
+            stmt.import_stmt() or stmt.dep_import_stmt()
+            for stmt in ctx.simple_stmts().simple_stmt()
+        )
+
+    def visitFile_input(self, ctx: ap.File_inputContext) -> KeyOptMap:
+        # Skip visiting statements that can't possibly declare anything
+        return self.visit_iterable_helper(filter(self._may_declare, ctx.stmt()))
+
     def visitImport_stmt(
         self, ctx: ap.Import_stmtContext
     ) -> KeyOptMap[tuple[Context.ImportPlaceholder, ap.Import_stmtContext]]:
@@ -286,14 +447,12 @@ class Wendy(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Ov
                         )
 
                     name = ref[0]
-                    if not hasattr(F, name) or not issubclass(
-                        getattr(F, name), (L.Module, L.ModuleInterface)
-                    ):
+                    if (node_type := _get_stdlib_nodes().get(name)) is None:
                         raise errors.UserKeyError.from_ctx(
                             ctx, f"Unknown standard library module: '{name}'"
                         )
 
-                    imports.append(KeyOptItem.from_kv(ref, (getattr(F, name), ctx)))
+                    imports.append(KeyOptItem.from_kv(ref, (node_type, ctx)))
 
             return KeyOptMap(imports)
 
@@ -337,25 +496,33 @@ class Wendy(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Ov
 
     # TODO: @v0.4: remove this shimming
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _find_shim(
         file_path: Path | None, ref: TypeRef
     ) -> tuple[Type[L.Node], str] | None:
         if file_path is None:
             return None
 
-        import_addr = address.AddrStr.from_parts(file_path, str(TypeRef(ref)))
+        entry = str(TypeRef(ref))
+        import_addr = address.AddrStr.from_parts(file_path, entry)
 
-        for shim_addr in shim_map:
+        for shim_addr in shim_addrs_by_entry.get(entry, ()):
             if import_addr.endswith(shim_addr):
                 return shim_map[shim_addr]
 
         return None
 
+    @classmethod
+    @once
+    def _get_surveyor(cls) -> "Wendy":
+        # Wendy doesn't keep any state between surveys, so she can be reused
+        return cls()
+
     @classmethod
     def survey(
         cls, file_path: Path | None, ctx: ap.BlockdefContext | ap.File_inputContext
     ) -> Context:
-        surveyor = cls()
+        surveyor = cls._get_surveyor()
         context = Context(file_path=file_path, scope_ctx=ctx, refs={})
         for ref, (item, item_ctx) in surveyor.visit(ctx):
             assert isinstance(item_ctx, ParserRuleContext)
@@ -374,21 +541,23 @@ class Wendy(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Ov
             if shim := cls._find_shim(context.file_path, ref):
                 shim_cls, preferred = shim
 
-                if hasattr(item_ctx, "name"):
-                    dep_ctx = item_ctx.name()  # type: ignore
-                elif hasattr(item_ctx, "reference"):
-                    dep_ctx = item_ctx.reference()  # type: ignore
-                else:
-                    dep_ctx = item_ctx
-
                 # TODO: @v0.4 increase the level of this to WARNING
                 # when there's an alternative
-                with downgrade(DeprecatedException, to_level=logging.DEBUG):
-                    raise DeprecatedException.from_ctx(
-                        dep_ctx,
-                        f"`{ref}` is deprecated and will be removed in a future"
-                        f" version. Use `{preferred}` instead.",
-                    )
+                shim_downgrade = downgrade(DeprecatedException, to_level=logging.DEBUG)
+                if not shim_downgrade.is_silent:
+                    if hasattr(item_ctx, "name"):
+                        dep_ctx = item_ctx.name()  # type: ignore
+                    elif hasattr(item_ctx, "reference"):
+                        dep_ctx = item_ctx.reference()  # type: ignore
+                    else:
+                        dep_ctx = item_ctx
+
+                    with shim_downgrade:
+                        raise DeprecatedException.from_ctx(
+                            dep_ctx,
+                            f"`{ref}` is deprecated and will be removed in a future"
+                            f" version. Use `{preferred}` instead.",
+                        )
 
                 context.refs[ref] = shim_cls
             else:
@@ -421,6 +590,9 @@ def _attach_ctx_to_ex(ctx: ParserRuleContext, traceback: Sequence[ParserRuleCont
         raise ex
 
 
+_FAEBRYK_LIBRARY_DIR = Path(inspect.getfile(F)).parent
+
+
 _declaration_domain_to_unit = {
     "dimensionless": dimensionless,
     "resistance": P.ohm,
@@ -433,7 +605,18 @@ _declaration_domain_to_unit = {
 }
 
 
-@dataclass
+def _dedupe_traceback(
+    stack: Iterable[ParserRuleContext],
+) -> list[ParserRuleContext]:
+    """Remove sequential duplicates from a traceback stack"""
+    traceback: list[ParserRuleContext] = []
+    for ctx in stack:
+        if not traceback or traceback[-1] is not ctx:
+            traceback.append(ctx)
+    return traceback
+
+
+@dataclass(slots=True)
 class _ParameterDefinition:
     """
     Holds information about a parameter declaration or assignment.
@@ -444,17 +627,23 @@ class _ParameterDefinition:
     """
 
     ctx: ParserRuleContext
-    traceback: Sequence[ParserRuleContext]
+    # Raw snapshot of Bob's traceback stack, see `traceback`
+    traceback_stack: tuple[ParserRuleContext, ...]
     ref: FieldRef
     value: Range | Single | None = None
 
+    @property
+    def traceback(self) -> Sequence[ParserRuleContext]:
+        # Only deduplicated on demand, since it's rarely needed for reporting
+        return _dedupe_traceback(self.traceback_stack)
+
     @property
     def is_declaration(self) -> bool:
         return self.value is None
 
     @property
     def is_definition(self) -> bool:
-        return not self.is_declaration
+        return self.value is not None
 
     def __post_init__(self):
         pass
@@ -482,8 +671,8 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
 
     def __init__(self) -> None:
         super().__init__()
-        self._scopes = FuncDict[ParserRuleContext, Context]()
-        self._python_classes = FuncDict[ap.BlockdefContext, Type[L.Module]]()
+        self._scopes: dict[ParserRuleContext, Context] = {}
+        self._python_classes: dict[ap.BlockdefContext, Type[L.Module]] = {}
         self._node_stack = StackList[L.Node]()
         self._traceback_stack = StackList[ParserRuleContext]()
 
@@ -495,7 +684,32 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         # Keeps track of the nodes whose construction failed,
         # so we don't report dud key errors when it was a higher failure
         # that caused the node not to exist
-        self._failed_nodes = FuncDict[L.Node, set[str]]()
+        # Weakly keyed so these don't pin nodes from previous builds
+        self._failed_nodes = WeakKeyDictionary[L.Node, set[str]]()
+
+        # Lazily built by `modules`, and dropped whenever a class or scope is added
+        self._modules: dict[address.AddrStr, Type[L.Module]] | None = None
+
+        self._search_paths_cache: dict[Path | None, list[Path]] = {}
+        self._node_attr_cache: dict[L.Node, dict[tuple[str, KeyType | None], Any]] = {}
+        self._path_exists_cache: dict[Path, bool] = {}
+
+        # Compiled arithmetic expressions, see `_evaluate_arithmetic`
+        self._arithmetic_programs = WeakKeyDictionary[
+            ParserRuleContext, tuple[_Instruction, ...]
+        ]()
+
+        self._literal_cache = WeakKeyDictionary[
+            ap.Literal_physicalContext, Quantity_Interval
+        ]()
+
+        # The scope each ctx is found in, filled in as `_get_scope` walks
+        self._scope_owners = WeakKeyDictionary[ParserRuleContext, Context]()
+
+        # Resolved classes, by the ctx they're referenced from and their ref
+        self._referenced_class_cache: dict[
+            tuple[ParserRuleContext, TypeRef], Type[L.Node] | ap.BlockdefContext
+        ] = {}
 
     def build_ast(
         self, ast: ap.File_inputContext, ref: TypeRef, file_path: Path | None = None
@@ -529,11 +743,14 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                 self._scopes[ctx_].file_path, str(TypeRef(ref))
             )
 
-        return {
-            addr: cls
-            for ctx, cls in self._python_classes.items()
-            if (addr := _get_addr(ctx)) is not None
-        }
+        if self._modules is None:
+            self._modules = {
+                addr: cls
+                for ctx, cls in self._python_classes.items()
+                if (addr := _get_addr(ctx)) is not None
+            }
+
+        return self._modules
 
     def _build(self, context: Context, ref: TypeRef) -> L.Node:
         assert self._is_reset()
@@ -569,7 +786,17 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         )
 
     def _finish(self):
-        self._merge_parameter_assignments()
+        try:
+            self._merge_parameter_assignments()
+        finally:
+            # The merge raises the build's accumulated errors, so clear in a
+            # finally to stop a failed build leaking state into the next one
+            self._referenced_class_cache.clear()
+            self._search_paths_cache.clear()
+            self._path_exists_cache.clear()
+            self._node_attr_cache.clear()
+            # Normally drained by the merge, but not if it died part way through
+            self._param_assignments.clear()
         assert self._is_reset()
 
     class ParamAssignmentIsGospel(errors.UserException):
@@ -585,18 +812,24 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
             errors._BaseBaseUserException, SkipPriorFailedException
         ) as ex_acc:
             # Handle missing definitions
-            params_without_defitions, params_with_definitions = partition_as_list(
-                lambda p: any(a.is_definition for a in self._param_assignments[p]),
-                self._param_assignments,
-            )
+            params_without_defitions: list[Parameter] = []
+            definitions_by_param: dict[Parameter, list[_ParameterDefinition]] = {}
+            for param, assignments in self._param_assignments.items():
+                if definitions := [a for a in assignments if a.value is not None]:
+                    definitions_by_param[param] = definitions
+                else:
+                    params_without_defitions.append(param)
 
+            # TODO: @v0.4 remove this deprecated import form
+            unassigned_downgrade = downgrade(
+                errors.UserActionWithoutEffectError, to_level=logging.DEBUG
+            )
             for param in params_without_defitions:
                 last_declaration = last(self._param_assignments.pop(param))
+                if unassigned_downgrade.is_silent:
+                    continue
                 with ex_acc.collect(), ato_error_converter():
-                    # TODO: @v0.4 remove this deprecated import form
-                    with downgrade(
-                        errors.UserActionWithoutEffectError, to_level=logging.DEBUG
-                    ):
+                    with unassigned_downgrade:
                         raise errors.UserActionWithoutEffectError.from_ctx(
                             last_declaration.ctx,
                             f"Attribute `{param}` declared but never assigned.",
@@ -610,9 +843,9 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
             # Allowing external assignments in the first place is a bit weird
             # Got to figure out how people are using this.
             # My guess is that in 99% of cases you can replace them by a `&=`
-            params_by_node = groupby(
-                params_with_definitions, key=lambda p: p.get_parent_force()[0]
-            )
+            params_by_node = defaultdict[L.Node, list[Parameter]](list)
+            for param in definitions_by_param:
+                params_by_node[param.get_parent_force()[0]].append(param)
             for assignee_node, assigned_params in params_by_node.items():
                 is_part_module = isinstance(assignee_node, L.Module) and (
                     assignee_node.has_trait(F.is_pickable_by_supplier_id)
@@ -621,13 +854,12 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
 
                 gospel_params: list[Parameter] = []
                 for param in assigned_params:
-                    assignments = self._param_assignments.pop(param)
-                    definitions = [a for a in assignments if a.is_definition]
-                    non_root_definitions, root_definitions = partition_as_list(
-                        lambda a: a.is_root_assignment, definitions
-                    )
+                    del self._param_assignments[param]
+                    definitions = definitions_by_param[param]
 
-                    assert definitions
+                    root_definitions: list[_ParameterDefinition] = []
+                    non_root_definitions: list[_ParameterDefinition] = []
+                    root_after_external = False
                     for definition in definitions:
                         logger.debug(
                             "Assignment:  %s [%s] := %s",
@@ -635,11 +867,13 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                             definition.ref,
                             definition.value,
                         )
+                        if definition.is_root_assignment:
+                            root_after_external |= bool(non_root_definitions)
+                            root_definitions.append(definition)
+                        else:
+                            non_root_definitions.append(definition)
 
                     # Don't see how this could happen, but just in case
-                    root_after_external = (False, True) in pairwise(
-                        a.is_root_assignment for a in definitions
-                    )
                     assert not root_after_external
 
                     with ex_acc.collect(), ato_error_converter():
@@ -673,8 +907,12 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                                     traceback=definition.traceback,
                                 ) from ex
 
-                if gospel_params:
-                    with downgrade(self.ParamAssignmentIsGospel, to_level=logging.INFO):
+                gospel_downgrade = downgrade(
+                    self.ParamAssignmentIsGospel, to_level=logging.INFO
+                )
+                # Skip building the message (and the full name) if it's discarded
+                if gospel_params and not gospel_downgrade.is_silent:
+                    with gospel_downgrade:
                         raise self.ParamAssignmentIsGospel(
                             f"`component` `{assignee_node.get_full_name()}`"
                             " is completely specified by a part number, so these"
@@ -688,8 +926,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
 
     def get_traceback(self) -> Sequence[ParserRuleContext]:
         """Return the current traceback, with sequential duplicates removed"""
-        # Use dict ordering guarantees and key uniqueness to remove duplicates
-        return list(dict.fromkeys(self._traceback_stack).keys())
+        return _dedupe_traceback(self._traceback_stack)
 
     @staticmethod
     def _sanitise_path(path: os.PathLike) -> Path:
@@ -703,6 +940,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
 
         context = Wendy.survey(file_path, ast)
         self._scopes[ast] = context
+        self._modules = None
         return context
 
     def index_file(self, file_path: Path) -> Context:
@@ -710,6 +948,11 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         return self.index_ast(ast, file_path)
 
     def _get_search_paths(self, context: Context) -> list[Path]:
+        # Search paths only depend on the file we're importing from,
+        # so there's no need to rebuild them for every import within a build
+        if context.file_path in self._search_paths_cache:
+            return self._search_paths_cache[context.file_path]
+
         search_paths = [Path(p) for p in self.search_paths]
 
         if context.file_path is not None:
@@ -719,10 +962,17 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
             search_paths += [config.project.paths.src, config.project.paths.modules]
 
         # Add the library directory to the search path too
-        search_paths.append(Path(inspect.getfile(F)).parent)
+        search_paths.append(_FAEBRYK_LIBRARY_DIR)
 
+        self._search_paths_cache[context.file_path] = search_paths
         return search_paths
 
+    def _path_exists(self, path: Path) -> bool:
+        """`path.exists()`, cached for the duration of a build"""
+        if path not in self._path_exists_cache:
+            self._path_exists_cache[path] = path.exists()
+        return self._path_exists_cache[path]
+
     def _import_item(
         self, context: Context, item: Context.ImportPlaceholder
     ) -> Type[L.Node] | ap.BlockdefContext:
@@ -731,7 +981,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         search_paths = self._get_search_paths(context)
         for search_path in search_paths:
             candidate_from_path = search_path / item.from_path
-            if candidate_from_path.exists():
+            if self._path_exists(candidate_from_path):
                 break
         else:
             raise errors.UserFileNotFoundError.from_ctx(
@@ -801,14 +1051,14 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
             else:
                 raise ValueError(f"Can't get class `{ref}` from {ctx}")
 
-        # Ascend the tree until we find a scope that has the ref within it
-        ctx_ = ctx
-        while ctx_ not in self._scopes:
-            if ctx_.parentCtx is None:
-                raise ValueError(f"No scope found for `{ref}`")
-            ctx_ = ctx_.parentCtx
+        # Resolved placeholders are cached too, so repeat lookups never
+        # go near the import machinery below
+        if (cached := self._referenced_class_cache.get((ctx, ref))) is not None:
+            return cached
 
-        context = self._scopes[ctx_]
+        context = self._get_scope(ctx)
+        if context is None:
+            raise ValueError(f"No scope found for `{ref}`")
 
         # FIXME: there are more cases to check here,
         # eg. if we have part of a ref resolved
@@ -824,8 +1074,30 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
             item = self._import_item(context, item)
             context.refs[ref] = item
 
+        self._referenced_class_cache[(ctx, ref)] = item
         return item
 
+    def _get_scope(self, ctx: ParserRuleContext) -> Context | None:
+        """
+        Ascend the tree until we find the scope the ctx is within
+
+        Every ctx passed on the way is remembered, so sibling lookups stop at
+        their first shared ancestor
+        """
+        visited: list[ParserRuleContext] = []
+        ctx_ = ctx
+        while (context := self._scope_owners.get(ctx_)) is None:
+            if (context := self._scopes.get(ctx_)) is not None:
+                break
+            visited.append(ctx_)
+            if ctx_.parentCtx is None:
+                return None
+            ctx_ = ctx_.parentCtx
+
+        for ctx_ in visited:
+            self._scope_owners[ctx_] = context
+        return context
+
     @staticmethod
     def get_node_attr(node: L.Node, ref: ReferencePartType) -> L.Node:
         """
@@ -834,10 +1106,67 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         Returns the value if it exists, otherwise raises an AttributeError
         Required because we're seeing attributes in both the attrs and runtime
         """
+        result = Bob._resolve_node_attr(node, ref)
+
+        if isinstance(result, L.Module):
+            return result.get_most_special()
+
+        return result
+
+    def _get_cached_node_attr(self, node: L.Node, ref: ReferencePartType) -> L.Node:
+        """
+        `get_node_attr`, memoized per-node for the duration of a build
+
+        Entries for a node are dropped whenever Bob adds to or removes from it,
+        see `_invalidate_node_attrs`
+        """
+        result = self._get_cached_node_attr_opt(node, ref)
+        if result is _MISSING:
+            raise AttributeError(name=_friendly_ref_name(ref), obj=node)
+        return result
 
-        if has_attr_or_property(node, ref.name):
+    def _get_cached_node_attr_opt(self, node: L.Node, ref: ReferencePartType) -> Any:
+        """
+        `_get_cached_node_attr`, except it returns `_MISSING` rather than raising
+        AttributeError when there's nothing there. For callers where a miss is
+        routine, like forward-declaration.
+        """
+        node_attrs = self._node_attr_cache.setdefault(node, {})
+        try:
+            result = node_attrs[(ref.name, ref.key)]
+        except KeyError:
+            result = self._probe_node_attr(node, ref)
+            if result is _MISSING:
+                # Misses aren't cached; they're about to be filled in
+                return result
+            node_attrs[(ref.name, ref.key)] = result
+
+        # Specialization can change without touching the node, so always check
+        if isinstance(result, L.Module):
+            return result.get_most_special()
+
+        return result
+
+    def _invalidate_node_attrs(self, node: L.Node):
+        """Forget the cached attributes of a node, because it's been modified"""
+        self._node_attr_cache.pop(node, None)
+
+    @staticmethod
+    def _resolve_node_attr(node: L.Node, ref: ReferencePartType) -> L.Node:
+        """Find an attribute of a node, without chasing specialization"""
+        result = Bob._probe_node_attr(node, ref)
+        if result is _MISSING:
+            # Wah wah wah - we don't know what this is
+            raise AttributeError(name=_friendly_ref_name(ref), obj=node)
+        return result
+
+    @staticmethod
+    def _probe_node_attr(node: L.Node, ref: ReferencePartType) -> Any:
+        """`_resolve_node_attr`, returning `_MISSING` if there's nothing there"""
+        result = _getattr_or_property(node, ref.name)
+
+        if result is not _MISSING:
             # Build-time attributes are attached as real attributes
-            result = getattr(node, ref.name)
             if ref.key is not None and isinstance(result, L.Node):
                 raise ValueError(f"{ref.name} is not subscriptable")
             if not isinstance(result, L.Node) and ref.key is None:
@@ -846,41 +1175,33 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                 )
             if isinstance(result, dict):
                 assert ref.key is not None
-                if ref.key not in result:
-                    raise AttributeError(name=f"{ref.name}[{ref.key}]", obj=node)
-                result = result[ref.key]
+                result = result.get(ref.key, _MISSING)
             elif isinstance(result, list):
                 assert ref.key is not None
                 # TODO type check key
                 if not isinstance(ref.key, int):
                     raise ValueError(f"Key `{ref.key}` is not an integer")
                 if ref.key >= len(result):
-                    raise AttributeError(name=f"{ref.name}[{ref.key}]", obj=node)
+                    return _MISSING
                 result = result[ref.key]
             # TODO handle non-module & non-dict & non-list case
-        elif ref.name in node.runtime and ref.key is None:
+        elif ref.key is None:
             # Runtime attributes are attached as runtime attributes
-            result = node.runtime[ref.name]
-        else:
-            # Wah wah wah - we don't know what this is
-            friendlyname = ref.name if ref.key is None else f"{ref.name}[{ref.key}]"
-            raise AttributeError(name=friendlyname, obj=node)
-
-        if isinstance(result, L.Module):
-            return result.get_most_special()
+            result = node.runtime.get(ref.name, _MISSING)
 
         return result
 
     def _get_referenced_node(self, ref: FieldRef, ctx: ParserRuleContext) -> L.Node:
         node = self._current_node
+        get_attr = self._get_cached_node_attr
         for i, name in enumerate(ref):
             try:
-                node = self.get_node_attr(node, name)
+                node = get_attr(node, name)
             except AttributeError as ex:
                 # If we know that a previous failure prevented the creation
                 # of this node, raise a SkipPriorFailedException to prevent
                 # error messages about it missing from polluting the output
-                if name in self._failed_nodes.get(node, set()):
+                if name.name in self._failed_nodes.get(node, _NO_FAILURES):
                     raise SkipPriorFailedException() from ex
 
                 # Wah wah wah - we don't know what this is
@@ -923,65 +1244,70 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         isn't already known, attaching the __atopile_src_ctx__ attribute to the new
         class.
         """
-        if isinstance(item, type) and issubclass(item, L.Node):
-            super_class = item
-            for super_ctx in promised_supers:
-                if super_ctx in self._python_classes:
-                    super_class = self._python_classes[super_ctx]
-                    continue
-
-                assert issubclass(super_class, L.Node)
-
-                # Create a new type with a more descriptive name
-                type_name = super_ctx.name().getText()
-                type_qualname = f"{super_class.__module__}.{type_name}"
-
-                super_class = type(
-                    type_name,  # Class name
-                    (super_class,),  # Base classes
-                    {
-                        "__module__": super_class.__module__,
-                        "__qualname__": type_qualname,
-                        "__atopile_src_ctx__": super_ctx,
-                    },
-                )
-
-                self._python_classes[super_ctx] = super_class
-
-            assert issubclass(super_class, L.Node)
-            return super_class(), promised_supers
-
-        if isinstance(item, ap.BlockdefContext):
+        # Walk up the super-chain until we hit a python class. We've got no
+        # information on when the super-chain will be resolved, so we need to
+        # promise that each blockdef will be visited as part of the init
+        super_chain: list[ap.BlockdefContext] = []
+        while isinstance(item, ap.BlockdefContext):
+            super_chain.append(item)
             # Find the superclass of the new node, if there's one defined
             block_type = item.blocktype()
             if super_ctx := item.blockdef_super():
                 super_ref = self.visitTypeReference(super_ctx.type_reference())
                 # Create a base node to build off
-                base_class = self._get_referenced_class(item, super_ref)
+                item = self._get_referenced_class(item, super_ref)
             else:
                 # Create a shell of base-node to build off
                 assert isinstance(block_type, ap.BlocktypeContext)
-                if block_type.INTERFACE():
-                    base_class = L.ModuleInterface
-                elif block_type.COMPONENT():
-                    base_class = L.Module
-                elif block_type.MODULE():
-                    base_class = L.Module
-                else:
-                    raise ValueError(f"Unknown block type `{block_type.getText()}`")
-
-            # Descend into building the superclass. We've got no information
-            # on when the super-chain will be resolved, so we need to promise
-            # that this current blockdef will be visited as part of the init
-            result = self._new_node(
-                base_class,
-                promised_supers=[item] + promised_supers,
+                try:
+                    item = _BASE_CLASS_BY_BLOCKTYPE[block_type.start.type]
+                except KeyError:
+                    raise ValueError(
+                        f"Unknown block type `{block_type.getText()}`"
+                    ) from None
+
+        if not (isinstance(item, type) and issubclass(item, L.Node)):
+            # This should never happen
+            raise ValueError(f"Unknown item type `{item}`")
+
+        super_chain.reverse()
+        promised_supers = super_chain + promised_supers
+
+        # Classes are created for the whole chain at once, so if the
+        # highest super is known, so is everything beneath it
+        if promised_supers and (
+            known_class := self._python_classes.get(promised_supers[-1])
+        ):
+            return known_class(), promised_supers
+
+        super_class = item
+        for super_ctx in promised_supers:
+            if super_ctx in self._python_classes:
+                super_class = self._python_classes[super_ctx]
+                continue
+
+            assert issubclass(super_class, L.Node)
+
+            # Create a new type with a more descriptive name
+            type_name = super_ctx.name().getText()
+            type_module = super_class.__module__
+            type_qualname = f"{type_module}.{type_name}"
+
+            super_class = type(
+                type_name,  # Class name
+                (super_class,),  # Base classes
+                {
+                    "__module__": type_module,
+                    "__qualname__": type_qualname,
+                    "__atopile_src_ctx__": super_ctx,
+                },
             )
 
-            return result
+            self._python_classes[super_ctx] = super_class
+            self._modules = None
 
-        # This should never happen
-        raise ValueError(f"Unknown item type `{item}`")
+        assert issubclass(super_class, L.Node)
+        return super_class(), promised_supers
 
     @contextmanager
     def _init_node(
@@ -1004,7 +1330,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         # Shim on component and module classes defined in ato
         # Do not shim fabll modules, or interfaces
         if isinstance(node_type, ap.BlockdefContext):
-            if node_type.blocktype().COMPONENT() or node_type.blocktype().MODULE():
+            if node_type.blocktype().start.type in (ap.COMPONENT, ap.MODULE):
                 # Some shims add the trait themselves
                 if not new_node.has_trait(_has_ato_cmp_attrs):
                     new_node.add(_has_ato_cmp_attrs())
@@ -1027,9 +1353,9 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         it later. Used in forward-declaration.
         """
         try:
-            node = self.get_node_attr(node, ref)
+            node = self._get_cached_node_attr(node, ref)
         except AttributeError as ex:
-            if ref in self._failed_nodes.get(node, set()):
+            if ref.name in self._failed_nodes.get(node, _NO_FAILURES):
                 raise SkipPriorFailedException() from ex
             # Wah wah wah - we don't know what this is
             raise errors.UserNotImplementedError.from_ctx(
@@ -1064,8 +1390,16 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         """
 
         try:
-            param = self.get_node_attr(node, ref)
+            param = self._get_cached_node_attr_opt(node, ref)
         except AttributeError:
+            # eg. a write-only property
+            param = _MISSING
+        except ValueError as ex:
+            raise errors.UserValueError.from_ctx(
+                src_ctx, str(ex), traceback=self.get_traceback()
+            ) from ex
+
+        if param is _MISSING:
             # Here we attach only minimal information, so we can override it later
             if ref.key is not None:
                 if not isinstance(ref.key, str):
@@ -1085,18 +1419,14 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                     Parameter(units=unit, domain=L.Domains.Numbers.REAL()),
                     name=ref.name,
                 )
-        except ValueError as ex:
-            raise errors.UserValueError.from_ctx(
-                src_ctx, str(ex), traceback=self.get_traceback()
-            ) from ex
-        else:
-            if not isinstance(param, Parameter):
-                raise errors.UserTypeError.from_ctx(
-                    src_ctx,
-                    f"Cannot assign a parameter to `{ref}` on `{node}` because its"
-                    f" type is `{param.__class__.__name__}`",
-                    traceback=self.get_traceback(),
-                )
+            self._invalidate_node_attrs(node)
+        elif not isinstance(param, Parameter):
+            raise errors.UserTypeError.from_ctx(
+                src_ctx,
+                f"Cannot assign a parameter to `{ref}` on `{node}` because its"
+                f" type is `{param.__class__.__name__}`",
+                traceback=self.get_traceback(),
+            )
 
         if not param.units.is_compatible_with(unit):
             raise errors.UserIncompatibleUnitError.from_ctx(
@@ -1146,6 +1476,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                     with self._init_node(
                         self._get_referenced_class(ctx, ref)
                     ) as new_node:
+                        self._invalidate_node_attrs(self._current_node)
                         try:
                             self._current_node.add(new_node, name=assigned_name.name)
                         except FieldExistsError as e:
@@ -1179,7 +1510,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                     ref=assigned_ref,
                     value=value,
                     ctx=ctx,
-                    traceback=self.get_traceback(),
+                    traceback_stack=tuple(self._traceback_stack),
                 )
             )
 
@@ -1193,6 +1524,9 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                     traceback=self.get_traceback(),
                 )
 
+            # Setters may well add to the target
+            self._invalidate_node_attrs(target)
+
             # Check if it's a property or attribute that can be set
             if has_instance_settable_attr(target, assigned_name.name):
                 try:
@@ -1200,15 +1534,8 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                 except errors.UserException as e:
                     e.attach_origin_from_ctx(assignable_ctx)
                     raise
-            elif (
-                # If ModuleShims has a settable property, use it
-                hasattr(GlobalAttributes, assigned_name.name)
-                and isinstance(getattr(GlobalAttributes, assigned_name.name), property)
-                and getattr(GlobalAttributes, assigned_name.name).fset
-            ):
-                prop = cast_assert(
-                    property, getattr(GlobalAttributes, assigned_name.name)
-                )
+            # If ModuleShims has a settable property, use it
+            elif prop := _GLOBAL_ATTRIBUTE_SETTERS.get(assigned_name.name):
                 assert prop.fset is not None
                 # TODO: @v0.4 remove this deprecated import form
                 with (
@@ -1237,7 +1564,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         self, name: ReferencePartType, ctx: ParserRuleContext
     ) -> L.ModuleInterface | None:
         try:
-            mif = self.get_node_attr(self._current_node, name)
+            mif = self._get_cached_node_attr_opt(self._current_node, name)
         except AttributeError:
             return None
         except ValueError as ex:
@@ -1245,6 +1572,9 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                 ctx, str(ex), traceback=self.get_traceback()
             ) from ex
 
+        if mif is _MISSING:
+            return None
+
         if isinstance(mif, L.ModuleInterface):
             # TODO: @v0.4 remove this deprecated import form
             with downgrade(errors.UserAlreadyExistsError):
@@ -1290,7 +1620,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                 )
         else:
             try:
-                mif = self.get_node_attr(self._current_node, ref)
+                mif = self._get_cached_node_attr(self._current_node, ref)
             except AttributeError:
                 pass
             else:
@@ -1300,6 +1630,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
 
         if shims_t := self._current_node.try_get_trait(_has_ato_cmp_attrs):
             mif = shims_t.add_pin(name, ref.name)
+            self._invalidate_node_attrs(self._current_node)
             return KeyOptMap.from_item(KeyOptItem.from_kv(TypeRef.from_one(name), mif))
 
         raise errors.UserTypeError.from_ctx(
@@ -1317,6 +1648,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
             return KeyOptMap.from_item(KeyOptItem.from_kv(TypeRef.from_one(name), mif))
 
         mif = self._current_node.add(F.Electrical(), name=name)
+        self._invalidate_node_attrs(self._current_node)
         return KeyOptMap.from_item(KeyOptItem.from_kv(TypeRef.from_one(name), mif))
 
     def _connect(
@@ -1359,19 +1691,17 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                 )
 
                 # If that fails, try connecting via duck-typing
-                for name, (c_a, c_b) in a.zip_children_by_name_with(
+                for name, c_a, c_b in a.zip_children_by_name_lazy(
                     b, L.ModuleInterface
-                ).items():
+                ):
                     if c_a is None:
-                        if has_attr_or_property(a, name):
-                            c_a = getattr(a, name)
-                        else:
+                        c_a = _getattr_or_property(a, name)
+                        if c_a is _MISSING:
                             raise top_ex
 
                     if c_b is None:
-                        if has_attr_or_property(b, name):
-                            c_b = getattr(b, name)
-                        else:
+                        c_b = _getattr_or_property(b, name)
+                        if c_b is _MISSING:
                             raise top_ex
 
                     try:
@@ -1398,15 +1728,9 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
 
     def visitConnect_stmt(self, ctx: ap.Connect_stmtContext):
         """Connect interfaces together"""
-        connectables = [self.visitConnectable(c) for c in ctx.connectable()]
-        for err_cltr, (a, b) in iter_through_errors(
-            itertools.pairwise(connectables),
-            errors._BaseBaseUserException,
-            SkipPriorFailedException,
-        ):
-            with err_cltr():
-                self._connect(a, b, ctx)
-
+        # The grammar only allows `connectable ~ connectable`
+        a, b = ctx.connectable()
+        self._connect(self.visitConnectable(a), self.visitConnectable(b), ctx)
         return NOTHING
 
     def visitConnectable(self, ctx: ap.ConnectableContext) -> L.ModuleInterface:
@@ -1487,6 +1811,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
             # Now, slot that badboi back in right where it's less-special brother's spot
             del parent.runtime[from_node_name]
             parent.add(specialized_node, name=from_node_name)
+            self._invalidate_node_attrs(parent)
 
             try:
                 from_node.specialize(specialized_node)
@@ -1535,140 +1860,189 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
     def visitComparison(
         self, ctx: ap.ComparisonContext
     ) -> KeyOptMap[ConstrainableExpression | BoolSet]:
+        compare_op_pairs = ctx.compare_op_pair()
         exprs = [
             self.visitArithmetic_expression(c)
             for c in [ctx.arithmetic_expression()]
-            + [cop.getChild(0).arithmetic_expression() for cop in ctx.compare_op_pair()]
-        ]
-        op_strs = [
-            cop.getChild(0).getChild(0).getText() for cop in ctx.compare_op_pair()
+            + [cop.getChild(0).arithmetic_expression() for cop in compare_op_pairs]
         ]
+        # Each pair starts with its operator's token
+        op_strs = [cop.start.text for cop in compare_op_pairs]
 
-        predicates = []
+        predicates: list[KeyOptItem[ConstrainableExpression | BoolSet]] = []
         for (lh, rh), op_str in zip(itertools.pairwise(exprs), op_strs):
-            match op_str:
-                # @v0.4 upgrade to error
-                case "<":
-                    with downgrade(
-                        errors.UserNotImplementedError, to_level=logging.WARNING
-                    ):
-                        raise errors.UserNotImplementedError(
-                            "`<` is not supported. Use `<=` instead."
-                        )
-                    op = LessOrEqual
-                case ">":
-                    with downgrade(
-                        errors.UserNotImplementedError, to_level=logging.WARNING
-                    ):
-                        raise errors.UserNotImplementedError(
-                            "`>` is not supported. Use `>=` instead."
-                        )
-                    op = GreaterOrEqual
-                case "<=":
-                    op = LessOrEqual
-                case ">=":
-                    op = GreaterOrEqual
-                case "within":
-                    op = IsSubset
-                case "is":
-                    op = Is
-                case _:
+            if (op := _COMPARISON_OPS.get(op_str)) is None:
+                if op_str not in _DEPRECATED_COMPARISON_OPS:
                     # We shouldn't be able to get here with parseable input
                     raise ValueError(f"Unhandled operator `{op_str}`")
 
+                # @v0.4 upgrade to error
+                replacement, op = _DEPRECATED_COMPARISON_OPS[op_str]
+                with downgrade(
+                    errors.UserNotImplementedError, to_level=logging.WARNING
+                ):
+                    raise errors.UserNotImplementedError(
+                        f"`{op_str}` is not supported. Use `{replacement}` instead."
+                    )
+
             # TODO: should we be reducing here to a series of ANDs?
-            predicates.append(op(lh, rh))
+            predicates.append(KeyOptItem((None, op(lh, rh))))
 
-        return KeyOptMap([KeyOptItem.from_kv(None, p) for p in predicates])
+        return KeyOptMap(predicates)
 
     def visitArithmetic_expression(
         self, ctx: ap.Arithmetic_expressionContext
     ) -> Numeric:
+        return self._evaluate_arithmetic(ctx, self._emit_arithmetic_expression)
+
+    def visitSum(self, ctx: ap.SumContext) -> Numeric:
+        return self._evaluate_arithmetic(ctx, self._emit_sum)
+
+    def visitTerm(self, ctx: ap.TermContext) -> Numeric:
+        return self._evaluate_arithmetic(ctx, self._emit_term)
+
+    def visitPower(self, ctx: ap.PowerContext) -> Numeric:
+        return self._evaluate_arithmetic(ctx, self._emit_power)
+
+    def visitFunctional(self, ctx: ap.FunctionalContext) -> Numeric:
+        return self._evaluate_arithmetic(ctx, self._emit_functional)
+
+    def visitBound(self, ctx: ap.BoundContext) -> Numeric:
+        return self._evaluate_arithmetic(ctx, self._emit_bound)
+
+    def visitAtom(self, ctx: ap.AtomContext) -> Numeric:
+        return self._evaluate_arithmetic(ctx, self._emit_atom)
+
+    # Arithmetic is compiled to a flat, postfix program the first time each
+    # expression is visited. Blocks are re-visited for every instance, so
+    # re-running that program saves walking the parse tree again.
+    # Field references stay symbolic, since they're resolved against
+    # whatever node is being built at the time.
+
+    def _evaluate_arithmetic[T: ParserRuleContext](
+        self, ctx: T, emit: Callable[[T, list[_Instruction]], None]
+    ) -> Numeric:
+        try:
+            program = self._arithmetic_programs[ctx]
+        except KeyError:
+            instructions: list[_Instruction] = []
+            emit(ctx, instructions)
+            program = self._arithmetic_programs[ctx] = tuple(instructions)
+
+        return self._run_arithmetic(program)
+
+    def _run_arithmetic(self, program: tuple[_Instruction, ...]) -> Numeric:
+        stack: list[Any] = []
+        for opcode, arg in program:
+            if opcode == _OP_CONST:
+                stack.append(arg)
+            elif opcode == _OP_PARAM:
+                ref, atom_ctx = arg
+                target = self._get_referenced_node(ref.stem, atom_ctx)
+                stack.append(self._get_param(target, ref.last, atom_ctx))
+            elif opcode == _OP_BINARY:
+                rh = stack.pop()
+                stack[-1] = arg(stack[-1], rh)
+            else:  # _OP_CALL
+                func, n_args = arg
+                operands = stack[len(stack) - n_args :]
+                del stack[len(stack) - n_args :]
+                stack.append(func(*operands))
+
+        return stack.pop()
+
+    def _emit_arithmetic_expression(
+        self, ctx: ap.Arithmetic_expressionContext, program: list[_Instruction]
+    ):
         if ctx.OR_OP() or ctx.AND_OP():
             raise errors.UserTypeError.from_ctx(
                 ctx,
                 "Logical operations are not supported",
                 traceback=self.get_traceback(),
             )
-            lh = self.visitArithmetic_expression(ctx.arithmetic_expression())
-            rh = self.visitSum(ctx.sum_())
-
-            if ctx.OR_OP():
-                return operator.or_(lh, rh)
-            else:
-                return operator.and_(lh, rh)
-
-        return self.visitSum(ctx.sum_())
-
-    def visitSum(self, ctx: ap.SumContext) -> Numeric:
-        if ctx.ADD() or ctx.MINUS():
-            lh = self.visitSum(ctx.sum_())
-            rh = self.visitTerm(ctx.term())
 
-            if ctx.ADD():
-                return operator.add(lh, rh)
-            else:
-                return operator.sub(lh, rh)
-
-        return self.visitTerm(ctx.term())
-
-    def visitTerm(self, ctx: ap.TermContext) -> Numeric:
-        if ctx.STAR() or ctx.DIV():
-            lh = self.visitTerm(ctx.term())
-            rh = self.visitPower(ctx.power())
+        self._emit_sum(ctx.sum_(), program)
 
-            if ctx.STAR():
-                return operator.mul(lh, rh)
-            else:
-                return operator.truediv(lh, rh)
+    def _emit_sum(self, ctx: ap.SumContext, program: list[_Instruction]):
+        # The grammar is left-recursive, so walk down the chain of sums
+        # collecting the operations, then emit them back up left-to-right
+        ops: list[tuple[Callable[[Any, Any], Any], ap.TermContext]] = []
+        while True:
+            add = ctx.ADD()
+            if not (add or ctx.MINUS()):
+                break
+            ops.append((operator.add if add else operator.sub, ctx.term()))
+            ctx = ctx.sum_()
+
+        self._emit_term(ctx.term(), program)
+        for op, term_ctx in reversed(ops):
+            self._emit_term(term_ctx, program)
+            _emit_binary(program, op)
+
+    def _emit_term(self, ctx: ap.TermContext, program: list[_Instruction]):
+        # Left-recursive, like sums
+        ops: list[tuple[Callable[[Any, Any], Any], ap.PowerContext]] = []
+        while True:
+            star = ctx.STAR()
+            if not (star or ctx.DIV()):
+                break
+            ops.append((operator.mul if star else operator.truediv, ctx.power()))
+            ctx = ctx.term()
 
-        return self.visitPower(ctx.power())
+        self._emit_power(ctx.power(), program)
+        for op, power_ctx in reversed(ops):
+            self._emit_power(power_ctx, program)
+            _emit_binary(program, op)
 
-    def visitPower(self, ctx: ap.PowerContext) -> Numeric:
+    def _emit_power(self, ctx: ap.PowerContext, program: list[_Instruction]):
         if ctx.POWER():
-            base, exp = map(self.visitFunctional, ctx.functional())
-            return operator.pow(base, exp)
+            base, exp = ctx.functional()
+            self._emit_functional(base, program)
+            self._emit_functional(exp, program)
+            _emit_binary(program, operator.pow)
         else:
-            return self.visitFunctional(ctx.functional(0))
-
-    def visitFunctional(self, ctx: ap.FunctionalContext) -> Numeric:
-        if ctx.name():
-            name = self.visitName(ctx.name())
-            operands = [self.visitBound(b) for b in ctx.bound()]
+            self._emit_functional(ctx.functional(0), program)
+
+    def _emit_functional(self, ctx: ap.FunctionalContext, program: list[_Instruction]):
+        if name_ctx := ctx.name():
+            name = self.visitName(name_ctx)
+            bounds = ctx.bound()
+            for bound_ctx in bounds:
+                self._emit_bound(bound_ctx, program)
             if name == "min":
-                return Min(*operands)
+                program.append((_OP_CALL, (Min, len(bounds))))
             elif name == "max":
-                return Max(*operands)
+                program.append((_OP_CALL, (Max, len(bounds))))
             else:
                 raise errors.UserNotImplementedError.from_ctx(
                     ctx, f"Unknown function `{name}`"
                 )
         else:
-            return self.visitBound(ctx.bound(0))
+            self._emit_bound(ctx.bound(0), program)
 
-    def visitBound(self, ctx: ap.BoundContext) -> Numeric:
-        return self.visitAtom(ctx.atom())
+    def _emit_bound(self, ctx: ap.BoundContext, program: list[_Instruction]):
+        self._emit_atom(ctx.atom(), program)
 
-    def visitAtom(self, ctx: ap.AtomContext) -> Numeric:
-        if ctx.field_reference():
-            ref = self.visitFieldReference(ctx.field_reference())
-            target = self._get_referenced_node(ref.stem, ctx)
-            return self._get_param(target, ref.last, ctx)
+    def _emit_atom(self, ctx: ap.AtomContext, program: list[_Instruction]):
+        if ref_ctx := ctx.field_reference():
+            ref = self.visitFieldReference(ref_ctx)
+            program.append((_OP_PARAM, (ref, ctx)))
 
-        elif ctx.literal_physical():
-            return self.visitLiteral_physical(ctx.literal_physical())
+        elif literal_ctx := ctx.literal_physical():
+            program.append((_OP_CONST, self.visitLiteral_physical(literal_ctx)))
 
         elif group_ctx := ctx.arithmetic_group():
             assert isinstance(group_ctx, ap.Arithmetic_groupContext)
-            return self.visitArithmetic_expression(group_ctx.arithmetic_expression())
+            self._emit_arithmetic_expression(group_ctx.arithmetic_expression(), program)
 
-        raise ValueError(f"Unhandled atom type `{ctx}`")
+        else:
+            raise ValueError(f"Unhandled atom type `{ctx}`")
 
     def _get_unit_from_ctx(self, ctx: ParserRuleContext) -> UnitType:
         """Return a pint unit from a context."""
-        unit_str = ctx.getText()
+        unit_str = _get_text(ctx)
         try:
-            return P.Unit(unit_str)
+            return _get_unit(unit_str)
         except UndefinedUnitError as ex:
             raise errors.UserUnknownUnitError.from_ctx(
                 ctx,
@@ -1680,25 +2054,31 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         self, ctx: ap.Literal_physicalContext
     ) -> Quantity_Interval:
         """Yield a physical value from a physical context."""
-        if ctx.quantity():
-            qty = self.visitQuantity(ctx.quantity())
+        # Literals are pure, so only build each one once
+        try:
+            return self._literal_cache[ctx]
+        except KeyError:
+            pass
+
+        if qty_ctx := ctx.quantity():
+            qty = self.visitQuantity(qty_ctx)
             value = Single(qty)
-        elif ctx.bilateral_quantity():
-            value = self.visitBilateral_quantity(ctx.bilateral_quantity())
-        elif ctx.bound_quantity():
-            value = self.visitBound_quantity(ctx.bound_quantity())
+        elif bilateral_ctx := ctx.bilateral_quantity():
+            value = self.visitBilateral_quantity(bilateral_ctx)
+        elif bound_ctx := ctx.bound_quantity():
+            value = self.visitBound_quantity(bound_ctx)
         else:
             # this should be protected because it shouldn't be parseable
             raise ValueError
+
+        self._literal_cache[ctx] = value
         return value
 
     def visitQuantity(self, ctx: ap.QuantityContext) -> Quantity:
         """Yield a physical value from an implicit quantity context."""
-        raw: str = ctx.NUMBER().getText()
-        if raw.startswith("0x"):
-            value = int(raw, 16)
-        else:
-            value = float(raw)
+        # NUMBER is a single token, so take its text straight off the token
+        raw: str = ctx.NUMBER().symbol.text
+        value = int(raw, 16) if raw[:2] == "0x" else float(raw)
 
         # Ignore the positive unary operator
         if ctx.MINUS():
@@ -1718,12 +2098,14 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
         nominal_qty = self.visitQuantity(ctx.quantity())
 
         tol_ctx: ap.Bilateral_toleranceContext = ctx.bilateral_tolerance()
-        tol_num = float(tol_ctx.NUMBER().getText())
+        tol_num = float(tol_ctx.NUMBER().symbol.text)
+
+        tol_name = tol_ctx.name()
 
         # Handle proportional tolerances
         if tol_ctx.PERCENT():
             tol_divider = 100
-        elif tol_ctx.name() and tol_ctx.name().getText() == "ppm":
+        elif tol_name and _get_text(tol_name) == "ppm":
             tol_divider = 1e6
         else:
             tol_divider = None
@@ -1741,23 +2123,25 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
             return Range.from_center_rel(nominal_qty, tol_value)
 
         # Ensure the tolerance has a unit
-        if tol_name := tol_ctx.name():
+        nominal_unitless = nominal_qty.unitless
+        if tol_name:
             # In this case there's a named unit on the tolerance itself
             tol_qty = tol_num * self._get_unit_from_ctx(tol_name)
-        elif nominal_qty.unitless:
+        elif nominal_unitless:
             tol_qty = tol_num * dimensionless
         else:
             tol_qty = tol_num * nominal_qty.units
+        tol_units = HasUnit.get_units(tol_qty)
 
         # Ensure units on the nominal quantity
-        if nominal_qty.unitless:
-            nominal_qty = nominal_qty * HasUnit.get_units(tol_qty)
+        if nominal_unitless:
+            nominal_qty = nominal_qty * tol_units
 
         # If the nominal has a unit, then we rely on the ranged value's unit compatibility # noqa: E501  # pre-existing
         if not nominal_qty.is_compatible_with(tol_qty):
             raise errors.UserTypeError.from_ctx(
                 tol_name,
-                f"Tolerance unit ({HasUnit.get_units(tol_qty)}) is not dimensionally"
+                f"Tolerance unit ({tol_units}) is not dimensionally"
                 f" compatible with nominal unit ({nominal_qty.units})",
                 traceback=self.get_traceback(),
             )
@@ -1907,7 +2291,7 @@ class Bob(BasicsMixin, SequenceMixin, AtoParserVisitor):  # type: ignore  # Over
                 _ParameterDefinition(
                     ref=FieldRef.from_type_ref(ref),
                     ctx=ctx,
-                    traceback=self.get_traceback(),
+                    traceback_stack=tuple(self._traceback_stack),
                 )
             )
 
@@ -1,9 +1,14 @@
+import hashlib
 import logging
+import time
 from os import PathLike
 from pathlib import Path
 
 from antlr4 import CommonTokenStream, FileStream, InputStream, Token
+from antlr4.atn.PredictionMode import PredictionMode
 from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.Errors import ParseCancellationException
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
 
 from atopile.parser.AtoLexer import AtoLexer
 from atopile.parser.AtoParser import AtoParser
@@ -53,6 +58,35 @@ def make_parser(src_stream: InputStream) -> AtoParser:
     return parser
 
 
+def _parse_file_input(parser: AtoParser) -> AtoParser.File_inputContext:
+    """
+    Parse a file input using ANTLR's two-stage strategy.
+
+    SLL prediction is much faster than full LL, and is sufficient for almost all
+    input. If it fails (either because the input is invalid, or it's one of the
+    rare cases that requires full-context prediction) we rewind and re-parse with
+    LL and the regular error handling, so errors are reported as usual.
+    """
+    # BailErrorStrategy still reports errors before bailing, so the listeners
+    # (which raise) are detached for the SLL pass, so the LL pass can run
+    listeners = parser._listeners
+    parser.removeErrorListeners()
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser._errHandler = BailErrorStrategy()
+    try:
+        return parser.file_input()
+    except ParseCancellationException:
+        pass
+    finally:
+        parser._listeners = listeners
+
+    parser.getTokenStream().seek(0)
+    parser.reset()
+    parser._interp.predictionMode = PredictionMode.LL
+    parser._errHandler = DefaultErrorStrategy()
+    return parser.file_input()
+
+
 def parse_text_as_file(
     src_code: str, src_path: None | str | Path = None
 ) -> AtoParser.File_inputContext:
@@ -61,7 +95,7 @@ def parse_text_as_file(
     input.name = src_path
     parser = make_parser(input)
 
-    tree = parser.file_input()
+    tree = _parse_file_input(parser)
 
     return tree
 
@@ -72,16 +106,29 @@ def parse_file(src_path: Path) -> AtoParser.File_inputContext:
     input.name = src_path
     parser = make_parser(input)
 
-    tree = parser.file_input()
+    tree = _parse_file_input(parser)
 
     return tree
 
 
 class FileParser:
-    """Parses a file."""
+    """
+    Parses a file.
+
+    ASTs are cached per-path, keyed on a hash of the source so unchanged files
+    are only parsed once, while edited files (eg. in the language server) are
+    re-parsed rather than served stale. Files whose mtime and size haven't
+    changed since they were hashed aren't re-read at all.
+    """
+
+    # Files modified this recently may be written to again within the same
+    # mtime tick (2s on FAT), so their stat can't be trusted to spot the change
+    RACY_MTIME_WINDOW_NS = 2_000_000_000
 
     def __init__(self) -> None:
-        self.cache = {}
+        self.cache: dict[
+            str, tuple[tuple[int, int] | None, str, AtoParser.File_inputContext]
+        ] = {}
 
     def get_ast_from_file(self, src_origin: PathLike) -> AtoParser.File_inputContext:
         """Get the AST from a file."""
@@ -89,12 +136,30 @@ class FileParser:
         src_origin_str = str(src_origin)
         src_origin_path = Path(src_origin)
 
-        if src_origin_str not in self.cache:
-            if not src_origin_path.exists():
-                raise UserFileNotFoundError(src_origin_str)
-            self.cache[src_origin_str] = parse_file(src_origin_path)
+        try:
+            stat = src_origin_path.stat()
+        except FileNotFoundError:
+            raise UserFileNotFoundError(src_origin_str)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self.cache.get(src_origin_str)
+        if cached is not None and cached[0] == stat_key:
+            return cached[2]
+
+        src = src_origin_path.read_bytes()
+        src_hash = hashlib.sha256(src).hexdigest()
+
+        if cached is not None and cached[1] == src_hash:
+            # Touched, but not changed
+            tree = cached[2]
+        else:
+            tree = parse_text_as_file(src.decode("utf-8"), src_origin_path)
+
+        if time.time_ns() - stat.st_mtime_ns < self.RACY_MTIME_WINDOW_NS:
+            stat_key = None
 
-        return self.cache[src_origin_str]
+        self.cache[src_origin_str] = (stat_key, src_hash, tree)
+        return tree
 
 
 parser = FileParser()
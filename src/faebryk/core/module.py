@@ -28,7 +28,13 @@ class Module(Node):
     specializes = f_field(GraphInterfaceModuleSibling)(is_parent=False)
     specialized = f_field(GraphInterfaceModuleSibling)(is_parent=True)
 
+    # Set by `specialize`, so unspecialized modules can skip the graph walk
+    _is_specialized: bool = False
+
     def get_most_special(self) -> "Module":
+        if not self._is_specialized:
+            return self
+
         specialers = {
             specialer
             for specialer_gif in self.specialized.get_gif_edges()
@@ -178,6 +184,7 @@ class Module(Node):
         #    special.add(t)
 
         self.specialized.connect(special.specializes)
+        self._is_specialized = True
 
         # Attach to new parent
         has_parent = special.get_parent() is not None
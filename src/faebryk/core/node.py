@@ -790,6 +790,24 @@ class Node(CNode):
         )
         return zip_dicts_by_key(*children)
 
+    def zip_children_by_name_lazy[N: Node](
+        self, other: "Node", sub_type: type[N]
+    ) -> Iterable[tuple[str, N | None, N | None]]:
+        """
+        Like `zip_children_by_name_with`, but yields `(name, self_child, other_child)`
+        as it goes, so callers bailing on the first mismatch don't pay for the rest
+        """
+        other_children = Node.with_names(
+            other.get_children(direct_only=True, include_root=False, types=sub_type)
+        )
+        for child in self.get_children(
+            direct_only=True, include_root=False, types=sub_type
+        ):
+            name = child.get_name()
+            yield name, child, other_children.pop(name, None)
+        for name, other_child in other_children.items():
+            yield name, None, other_child
+
     @staticmethod
     def with_names[N: Node](nodes: Iterable[N]) -> dict[str, N]:
         return {n.get_name(): n for n in nodes}
@@ -276,6 +276,15 @@ class downgrade[T: Exception](Pacman):
         self.logger = logger
         self.raise_anyway = raise_anyway
 
+    @property
+    def is_silent(self) -> bool:
+        """
+        True if a downgraded exception would be neither logged nor re-raised.
+
+        Lets callers skip building expensive messages that'd only be discarded.
+        """
+        return not self.raise_anyway and not self.logger.isEnabledFor(self.to_level)
+
     def nom_nom_nom(self, exc: T, original_exinfo):
         if isinstance(exc, ExceptionGroup):
             exceptions = exc.exceptions
@@ -16,7 +16,7 @@ from faebryk.libs.kicad.fileformats_latest import (
 )
 from faebryk.libs.kicad.fileformats_v5 import C_kicad_footprint_file_v5
 from faebryk.libs.kicad.fileformats_v6 import C_kicad_footprint_file_v6
-from faebryk.libs.sexp.dataclass_sexp import DecodeError, loads
+from faebryk.libs.sexp.dataclass_sexp import DecodeError, loads, parse_sexp
 from faebryk.libs.util import try_relative_to
 
 logger = logging.getLogger(__name__)
@@ -37,21 +37,24 @@ KICAD_VERSION_NAMES = {
 
 def kicad_footprint_file(path: Path) -> C_kicad_footprint_file:
     acc = accumulate(DecodeError, group_message="No decoders succeeded")
-    if path.read_text(encoding="utf-8").startswith("(module"):
+    # Read and parse the file once; the header and every decoder share the sexp
+    text = path.read_text(encoding="utf-8")
+    if text.startswith("(module"):
         with acc.collect():
-            return loads(path, C_kicad_footprint_file_v5).convert_to_new()
+            return loads(parse_sexp(text), C_kicad_footprint_file_v5).convert_to_new()
     else:
-        header = loads(path, C_kicad_footprint_file_header)
+        sexp = parse_sexp(text)
+        header = loads(sexp, C_kicad_footprint_file_header)
         version = header.footprint.version
         if version < 20240101:
             with acc.collect():
-                return loads(path, C_kicad_footprint_file_v6).convert_to_new()
+                return loads(sexp, C_kicad_footprint_file_v6).convert_to_new()
         else:
             with acc.collect():
-                return loads(path, C_kicad_footprint_file)
+                return loads(sexp, C_kicad_footprint_file)
 
             with acc.collect():
-                return loads(path, C_kicad_footprint_file, ignore_assertions=True)
+                return loads(sexp, C_kicad_footprint_file, ignore_assertions=True)
 
     # Nothing succeeded in loading the file
     raise UserResourceException(
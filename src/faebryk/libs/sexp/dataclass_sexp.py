@@ -535,6 +535,14 @@ def _encode(t) -> netlist_type:
     return sexp
 
 
+def parse_sexp(text: str) -> list:
+    """Parse text into the raw sexp lists that `loads` accepts"""
+    try:
+        return sexpdata.loads(text)
+    except Exception as e:
+        raise ParseError(f"Failed to parse sexp: {text}") from e
+
+
 def loads[T: DataclassInstance](
     s: str | Path | list, t: type[T], ignore_assertions: bool = False
 ) -> T:
@@ -543,10 +551,7 @@ def loads[T: DataclassInstance](
     if isinstance(s, Path):
         text = s.read_text(encoding="utf-8")
     if isinstance(text, str):
-        try:
-            sexp = sexpdata.loads(text)
-        except Exception as e:
-            raise ParseError(f"Failed to parse sexp: {text}") from e
+        sexp = parse_sexp(text)
 
     try:
         return _decode([sexp], t, ignore_assertions=ignore_assertions)
@@ -1,3 +1,4 @@
+import weakref
 from unittest.mock import Mock
 
 import pytest
@@ -64,3 +65,14 @@ def test_deepest_common_parent_same_branch(node_hierarchy):
         node_hierarchy.grandchild1, node_hierarchy.child1
     )
     assert result == (node_hierarchy.child1, "child1")
+
+
+def test_node_weakref():
+    # Nodes are nanobind-backed, but Bob keys per-build state on them weakly
+    node = Node()
+    ref = weakref.ref(node)
+    assert ref() is node
+
+    by_node = weakref.WeakKeyDictionary[Node, int]()
+    by_node[node] = 1
+    assert by_node[node] == 1
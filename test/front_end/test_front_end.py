@@ -1,5 +1,8 @@
+from collections import defaultdict
+from functools import cache
 from pathlib import Path
 from textwrap import dedent
+from typing import Any
 
 import pytest
 
@@ -7,13 +10,27 @@ import faebryk.core.parameter as fab_param
 import faebryk.library._F as F
 from atopile import address, errors
 from atopile.datatypes import ReferencePartType, TypeRef
-from atopile.front_end import Bob, _has_ato_cmp_attrs
+from atopile.front_end import (
+    _OP_BINARY,
+    _OP_CALL,
+    _OP_CONST,
+    _OP_PARAM,
+    Bob,
+    _has_ato_cmp_attrs,
+)
 from atopile.parse import parse_text_as_file
 from faebryk.libs.library import L
 from faebryk.libs.picker.picker import DescriptiveProperties
 from faebryk.libs.util import cast_assert
 
 
+# Parse trees aren't modified by building, so identical sources can share one
+_parse_cached = cache(parse_text_as_file)
+
+# Reference parts are immutable and compare by value, so share them too
+_ref_part = cache(ReferencePartType)
+
+
 def _get_mif(node: L.Node, name: str, key: str | None = None) -> L.ModuleInterface:
     return cast_assert(
         L.ModuleInterface,
@@ -22,7 +39,7 @@ def _get_mif(node: L.Node, name: str, key: str | None = None) -> L.ModuleInterfa
 
 
 def _get_attr(node: L.Node, name: str, key: str | None = None) -> L.Node:
-    return Bob.get_node_attr(node, ReferencePartType(name, key))
+    return Bob.get_node_attr(node, _ref_part(name, key))
 
 
 def test_empty_module_build(bob: Bob):
@@ -32,7 +49,7 @@ def test_empty_module_build(bob: Bob):
             pass
         """
     )
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["A"]))
     assert isinstance(node, L.Module)
     assert isinstance(node, bob.modules[address.AddrStr(":A")])
@@ -45,7 +62,7 @@ def test_simple_module_build(bob: Bob):
             a = 1
         """
     )
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["A"]))
     assert isinstance(node, L.Module)
 
@@ -62,7 +79,7 @@ def test_arithmetic(bob: Bob):
             b = a + 4
         """
     )
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["A"]))
     assert isinstance(node, L.Module)
 
@@ -70,6 +87,284 @@ def test_arithmetic(bob: Bob):
     # Requires params solver to be sane
 
 
+def _capture_arithmetic(
+    bob: Bob, monkeypatch: pytest.MonkeyPatch
+) -> dict[str, list[Any]]:
+    """Record the result of every arithmetic expression Bob evaluates, by source"""
+    results = defaultdict[str, list[Any]](list)
+    evaluate = bob._evaluate_arithmetic
+
+    def _evaluate(ctx, emit):
+        result = evaluate(ctx, emit)
+        results[ctx.getText()].append(result)
+        return result
+
+    monkeypatch.setattr(bob, "_evaluate_arithmetic", _evaluate)
+    return results
+
+
+def _arithmetic_program(bob: Bob, text: str) -> tuple[tuple[int, Any], ...]:
+    (program,) = [
+        program
+        for ctx, program in bob._arithmetic_programs.items()
+        if ctx.getText() == text
+    ]
+    return program
+
+
+def _opcodes(program: tuple[tuple[int, Any], ...]) -> list[int]:
+    return [opcode for opcode, _ in program]
+
+
+def test_arithmetic_left_associative(bob: Bob, monkeypatch: pytest.MonkeyPatch):
+    text = dedent(
+        """
+        module A:
+            a = 1
+            b = 2
+            c = 3
+            difference = a - b - c
+            quotient = a / b / c
+        """
+    )
+    results = _capture_arithmetic(bob, monkeypatch)
+    node = bob.build_ast(_parse_cached(text), TypeRef(["A"]))
+    a, b, c = (_get_attr(node, name) for name in "abc")
+
+    (difference,) = results["a-b-c"]
+    assert isinstance(difference, fab_param.Subtract)
+    inner, rh = difference.operands
+    assert isinstance(inner, fab_param.Subtract)
+    assert inner.operands == (a, b)
+    assert rh is c
+
+    (quotient,) = results["a/b/c"]
+    assert isinstance(quotient, fab_param.Divide)
+    inner, rh = quotient.operands
+    assert isinstance(inner, fab_param.Divide)
+    assert inner.operands == (a, b)
+    assert rh is c
+
+    assert _opcodes(_arithmetic_program(bob, "a-b-c")) == [
+        _OP_PARAM,
+        _OP_PARAM,
+        _OP_BINARY,
+        _OP_PARAM,
+        _OP_BINARY,
+    ]
+
+
+def test_arithmetic_power(bob: Bob, monkeypatch: pytest.MonkeyPatch):
+    text = dedent(
+        """
+        module A:
+            a = 1
+            b = 2
+            c = 3
+            x = a * b ** c
+            y = (a + b) ** 2
+        """
+    )
+    results = _capture_arithmetic(bob, monkeypatch)
+    node = bob.build_ast(_parse_cached(text), TypeRef(["A"]))
+    a, b, c = (_get_attr(node, name) for name in "abc")
+
+    # `**` binds tighter than `*`, and keeps its base and exponent in order
+    (x,) = results["a*b**c"]
+    assert isinstance(x, fab_param.Multiply)
+    lh, power = x.operands
+    assert lh is a
+    assert isinstance(power, fab_param.Power)
+    assert power.operands == (b, c)
+
+    (y,) = results["(a+b)**2"]
+    assert isinstance(y, fab_param.Power)
+    base, exponent = y.operands
+    assert isinstance(base, fab_param.Add)
+    assert base.operands == (a, b)
+    assert exponent == L.Single(2)
+
+
+def test_arithmetic_functions(bob: Bob, monkeypatch: pytest.MonkeyPatch):
+    text = dedent(
+        """
+        module A:
+            a = 1
+            b = 2
+            lo = min(a b)
+            hi = max(a 2)
+        """
+    )
+    results = _capture_arithmetic(bob, monkeypatch)
+    node = bob.build_ast(_parse_cached(text), TypeRef(["A"]))
+    a, b = _get_attr(node, "a"), _get_attr(node, "b")
+
+    (lo,) = results["min(ab)"]
+    assert isinstance(lo, fab_param.Min)
+    assert lo.operands == (a, b)
+
+    (hi,) = results["max(a2)"]
+    assert isinstance(hi, fab_param.Max)
+    assert hi.operands[0] is a
+    assert hi.operands[1] == L.Single(2)
+
+    assert _arithmetic_program(bob, "min(ab)")[-1] == (_OP_CALL, (fab_param.Min, 2))
+
+
+def test_arithmetic_unary_minus(bob: Bob, monkeypatch: pytest.MonkeyPatch):
+    text = dedent(
+        """
+        module A:
+            a = 1
+            x = a * -2
+            y = a - -2
+        """
+    )
+    results = _capture_arithmetic(bob, monkeypatch)
+    node = bob.build_ast(_parse_cached(text), TypeRef(["A"]))
+    a = _get_attr(node, "a")
+
+    (x,) = results["a*-2"]
+    assert isinstance(x, fab_param.Multiply)
+    assert x.operands[0] is a
+    assert x.operands[1] == L.Single(-2)
+
+    (y,) = results["a--2"]
+    assert isinstance(y, fab_param.Subtract)
+    assert y.operands[0] is a
+    assert y.operands[1] == L.Single(-2)
+
+
+def test_arithmetic_constant_folding(bob: Bob, monkeypatch: pytest.MonkeyPatch):
+    text = dedent(
+        """
+        module A:
+            x = 10 / 2 - 3
+            y = 20 / 2 / 5
+            z = 10 - 4 - 3
+        """
+    )
+    results = _capture_arithmetic(bob, monkeypatch)
+    bob.build_ast(_parse_cached(text), TypeRef(["A"]))
+
+    # Folded to a single constant, equal to evaluating the literals in order
+    for src, unfolded in [
+        ("10/2-3", L.Single(10) / L.Single(2) - L.Single(3)),
+        ("20/2/5", L.Single(20) / L.Single(2) / L.Single(5)),
+        ("10-4-3", L.Single(10) - L.Single(4) - L.Single(3)),
+    ]:
+        ((opcode, value),) = _arithmetic_program(bob, src)
+        assert opcode == _OP_CONST
+        assert value == unfolded
+        assert results[src] == [unfolded]
+
+    assert results["10/2-3"] == [L.Single(2)]
+    assert results["20/2/5"] == [L.Single(2)]
+    assert results["10-4-3"] == [L.Single(3)]
+
+
+def test_arithmetic_no_folding_past_params(bob: Bob, monkeypatch: pytest.MonkeyPatch):
+    text = dedent(
+        """
+        module A:
+            a = 1
+            p = a + 2 * 3
+            q = a * 2 * 3
+            r = 2 * 3 * a
+        """
+    )
+    results = _capture_arithmetic(bob, monkeypatch)
+    node = bob.build_ast(_parse_cached(text), TypeRef(["A"]))
+    a = _get_attr(node, "a")
+
+    # `2 * 3` is its own sub-expression, so it's folded
+    p_program = _arithmetic_program(bob, "a+2*3")
+    assert _opcodes(p_program) == [_OP_PARAM, _OP_CONST, _OP_BINARY]
+    assert p_program[1][1] == L.Single(6)
+    (p,) = results["a+2*3"]
+    assert isinstance(p, fab_param.Add)
+    assert p.operands[0] is a
+    assert p.operands[1] == L.Single(6)
+
+    # `(a * 2) * 3` - the literals are either side of a param, so aren't
+    q_program = _arithmetic_program(bob, "a*2*3")
+    assert _opcodes(q_program) == [
+        _OP_PARAM,
+        _OP_CONST,
+        _OP_BINARY,
+        _OP_CONST,
+        _OP_BINARY,
+    ]
+    (q,) = results["a*2*3"]
+    assert isinstance(q, fab_param.Multiply)
+    inner, rh = q.operands
+    assert isinstance(inner, fab_param.Multiply)
+    assert inner.operands[0] is a
+    assert inner.operands[1] == L.Single(2)
+    assert rh == L.Single(3)
+
+    # `(2 * 3) * a` - folded up to the param
+    r_program = _arithmetic_program(bob, "2*3*a")
+    assert _opcodes(r_program) == [_OP_CONST, _OP_PARAM, _OP_BINARY]
+    assert r_program[0][1] == L.Single(6)
+
+
+def test_arithmetic_opcodes(bob: Bob, monkeypatch: pytest.MonkeyPatch):
+    text = dedent(
+        """
+        module A:
+            a = 1
+            x = max(a 2) + 3 * 4
+        """
+    )
+    results = _capture_arithmetic(bob, monkeypatch)
+    node = bob.build_ast(_parse_cached(text), TypeRef(["A"]))
+
+    # Exercises every opcode
+    program = _arithmetic_program(bob, "max(a2)+3*4")
+    assert _opcodes(program) == [
+        _OP_PARAM,
+        _OP_CONST,
+        _OP_CALL,
+        _OP_CONST,
+        _OP_BINARY,
+    ]
+
+    (x,) = results["max(a2)+3*4"]
+    assert isinstance(x, fab_param.Add)
+    call, const = x.operands
+    assert isinstance(call, fab_param.Max)
+    assert call.operands[0] is _get_attr(node, "a")
+    assert call.operands[1] == L.Single(2)
+    assert const == L.Single(12)
+
+
+def test_arithmetic_program_reused_per_instance(
+    bob: Bob, monkeypatch: pytest.MonkeyPatch
+):
+    text = dedent(
+        """
+        module Inner:
+            a = 1
+            b = a + 1
+
+        module App:
+            i1 = new Inner
+            i2 = new Inner
+        """
+    )
+    results = _capture_arithmetic(bob, monkeypatch)
+    node = bob.build_ast(_parse_cached(text), TypeRef(["App"]))
+
+    # One compiled program for the expression, run once per instance
+    _arithmetic_program(bob, "a+1")
+    first, second = results["a+1"]
+
+    # ... with each run bound to its own instance's params
+    assert first.operands[0] is _get_attr(_get_attr(node, "i1"), "a")
+    assert second.operands[0] is _get_attr(_get_attr(node, "i2"), "a")
+
+
 def test_simple_new(bob: Bob):
     text = dedent(
         """
@@ -81,7 +376,7 @@ def test_simple_new(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["A"]))
 
     assert isinstance(node, L.Module)
@@ -120,7 +415,7 @@ def test_nested_nodes(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["A"]))
 
     assert isinstance(node, L.Module)
@@ -143,7 +438,7 @@ def test_resistor(bob: Bob, repo_root: Path):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["A"]))
 
     assert isinstance(node, L.Module)
@@ -164,7 +459,7 @@ def test_standard_library_import(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["A"]))
 
     assert isinstance(node, L.Module)
@@ -216,7 +511,7 @@ def test_reserved_attrs(
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["A"]))
 
     assert isinstance(node, L.Module)
@@ -257,7 +552,7 @@ def test_import_ato(bob: Bob, tmp_path):
 
     bob.search_paths.append(some_module_search_path)
 
-    tree = parse_text_as_file(top_module_content)
+    tree = _parse_cached(top_module_content)
     node = bob.build_ast(tree, TypeRef(["A"]))
 
     assert isinstance(node, L.Module)
@@ -266,6 +561,107 @@ def test_import_ato(bob: Bob, tmp_path):
     assert isinstance(r1, F.Resistor)
 
 
+def test_build_state_cleared_after_failure(bob: Bob, monkeypatch: pytest.MonkeyPatch):
+    text = dedent(
+        """
+        import Resistor
+
+        module A:
+            r1 = new Resistor
+            r1.resistance = 10kohm +/- 5%
+        """
+    )
+
+    tree = _parse_cached(text)
+
+    def _assert_build_state_cleared():
+        assert not bob._referenced_class_cache
+        assert not bob._search_paths_cache
+        assert not bob._path_exists_cache
+        assert not bob._node_attr_cache
+        assert bob._is_reset()
+
+    def _failing_merge():
+        raise errors.UserException("merge failed")
+
+    monkeypatch.setattr(bob, "_merge_parameter_assignments", _failing_merge)
+    with pytest.raises(errors.UserException, match="merge failed"):
+        bob.build_ast(tree, TypeRef(["A"]))
+    _assert_build_state_cleared()
+
+    monkeypatch.undo()
+    node = bob.build_ast(tree, TypeRef(["A"]))
+    assert isinstance(node, L.Module)
+    _assert_build_state_cleared()
+
+
+def test_node_attr_cache_invalidated(bob: Bob):
+    text = dedent(
+        """
+        module Leaf:
+            signal x
+
+        module SpecialLeaf from Leaf:
+            pass
+
+        module Inner:
+            leaf = new Leaf
+
+        module App:
+            inner = new Inner
+            signal before ~ inner.leaf.x
+            inner.leaf -> SpecialLeaf
+            inner.leaf.value = 1
+
+            extra = new Leaf
+            signal after ~ extra.x
+        """
+    )
+
+    tree = _parse_cached(text)
+    node = bob.build_ast(tree, TypeRef(["App"]))
+
+    # `inner.leaf` was looked up before the retype, so must be re-resolved after
+    leaf = _get_attr(_get_attr(node, "inner"), "leaf")
+    assert type(leaf).__name__ == "SpecialLeaf"
+    assert isinstance(_get_attr(leaf, "value"), fab_param.Parameter)
+
+    # Likewise for children added after the parent's attrs were looked up
+    assert _get_mif(node, "after").is_connected_to(
+        _get_mif(_get_attr(node, "extra"), "x")
+    )
+
+
+def _flatten_exceptions(ex: BaseException) -> list[BaseException]:
+    if isinstance(ex, BaseExceptionGroup):
+        return [leaf for sub in ex.exceptions for leaf in _flatten_exceptions(sub)]
+    return [ex]
+
+
+def test_reference_to_failed_node_is_skipped(bob: Bob):
+    text = dedent(
+        """
+        module Broken:
+            doesnt_exit ~ notta_connectable
+
+        module App:
+            broken = new Broken
+            signal s
+            s ~ broken.x
+        """
+    )
+
+    tree = _parse_cached(text)
+
+    with pytest.raises((errors.UserException, ExceptionGroup)) as e:
+        bob.build_ast(tree, TypeRef(["App"]))
+
+    leaves = _flatten_exceptions(e.value)
+    assert any(isinstance(leaf, errors.UserKeyError) for leaf in leaves)
+    # `broken` failed to build, so referencing it mustn't add a second error
+    assert not any("broken" in getattr(leaf, "message", str(leaf)) for leaf in leaves)
+
+
 @pytest.mark.parametrize(
     "module,count", [("A", 1), ("B", 3), ("C", 5), ("D", 6), ("E", 6)]
 )
@@ -289,7 +685,7 @@ def test_traceback(bob: Bob, module: str, count: int):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
 
     with pytest.raises(errors.UserKeyError) as e:
         bob.build_ast(tree, TypeRef([module]))
@@ -313,7 +709,7 @@ def test_signal_connect(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["App"]))
 
     assert isinstance(node, L.Module)
@@ -341,7 +737,7 @@ def test_interface_connect(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["App"]))
 
     assert isinstance(node, L.Module)
@@ -388,7 +784,7 @@ def test_duck_type_connect(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["App"]))
 
     assert isinstance(node, L.Module)
@@ -431,7 +827,7 @@ def test_requires(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["App"]))
 
     assert isinstance(node, L.Module)
@@ -450,7 +846,7 @@ def test_key(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["App"]))
 
     assert isinstance(node, L.Module)
@@ -471,7 +867,7 @@ def test_pin_ref(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["App"]))
 
     assert isinstance(node, L.Module)
@@ -487,7 +883,7 @@ def test_non_ex_pin_ref(bob: Bob):
         """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     with pytest.raises(errors.UserKeyError):
         bob.build_ast(tree, TypeRef(["App"]))
 
@@ -514,7 +910,7 @@ def test_regression_pin_refs(bob: Bob):
     """
     )
 
-    tree = parse_text_as_file(text)
+    tree = _parse_cached(text)
     node = bob.build_ast(tree, TypeRef(["App"]))
 
     assert isinstance(node, L.Module)
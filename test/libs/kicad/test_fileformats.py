@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+from copy import deepcopy
 from pathlib import Path
 
 import pytest
@@ -43,9 +44,47 @@ logger = logging.getLogger(__name__)
 
 DUMP = ConfigFlag("DUMP", descr="dump load->save into /tmp")
 
+# Keep these on one worker, so the module-scoped fixtures are only loaded once
+pytestmark = pytest.mark.xdist_group("kicad_fileformats")
 
-def test_parser_netlist():
-    netlist = C_kicad_netlist_file.loads(NETFILE)
+
+# Each file is only parsed once per module; tests that modify one take a deepcopy
+@pytest.fixture(scope="module")
+def netlist() -> C_kicad_netlist_file:
+    return C_kicad_netlist_file.loads(NETFILE)
+
+
+@pytest.fixture(scope="module")
+def project() -> C_kicad_project_file:
+    return C_kicad_project_file.loads(PRJFILE)
+
+
+@pytest.fixture(scope="module")
+def schematic() -> C_kicad_sch_file:
+    return C_kicad_sch_file.loads(SCHFILE)
+
+
+@pytest.fixture(scope="module")
+def symbols() -> C_kicad_sym_file:
+    return C_kicad_sym_file.loads(SYMFILE)
+
+
+@pytest.fixture(scope="module")
+def pcb() -> C_kicad_pcb_file:
+    return C_kicad_pcb_file.loads(PCBFILE)
+
+
+@pytest.fixture(scope="module")
+def footprint() -> C_kicad_footprint_file:
+    return C_kicad_footprint_file.loads(FPFILE)
+
+
+@pytest.fixture(scope="module")
+def fp_lib_table() -> C_kicad_fp_lib_table_file:
+    return C_kicad_fp_lib_table_file.loads(FPLIBFILE)
+
+
+def test_parser_netlist(netlist: C_kicad_netlist_file):
     assert [(c.ref, c.value) for c in netlist.export.components.comps][:10] == [
         ("C1", "10uF"),
         ("C2", "10uF"),
@@ -60,35 +99,31 @@ def test_parser_netlist():
     ]
 
 
-def test_parser_project():
-    pro = C_kicad_project_file.loads(PRJFILE)
-    assert pro.pcbnew.last_paths.netlist == "../../faebryk/faebryk.net"
+def test_parser_project(project: C_kicad_project_file):
+    assert project.pcbnew.last_paths.netlist == "../../faebryk/faebryk.net"
 
 
-def test_parser_schematics():
-    sch = C_kicad_sch_file.loads(SCHFILE)
-    assert sch.kicad_sch.lib_symbols.symbols["power:GND"].power is not None
-    assert sch.kicad_sch.lib_symbols.symbols["Device:R"].power is None
+def test_parser_schematics(schematic: C_kicad_sch_file):
+    assert schematic.kicad_sch.lib_symbols.symbols["power:GND"].power is not None
+    assert schematic.kicad_sch.lib_symbols.symbols["Device:R"].power is None
     assert (
-        sch.kicad_sch.lib_symbols.symbols["Amplifier_Audio:LM4990ITL"]
+        schematic.kicad_sch.lib_symbols.symbols["Amplifier_Audio:LM4990ITL"]
         .propertys["Datasheet"]
         .value
         == "http://www.ti.com/lit/ds/symlink/lm4990.pdf"
     )
 
 
-def test_parser_symbols():
-    sym = C_kicad_sym_file.loads(SYMFILE)
+def test_parser_symbols(symbols: C_kicad_sym_file):
     assert (
-        sym.kicad_symbol_lib.symbols["AudioJack-CUI-SJ-3523-SMT"].name
+        symbols.kicad_symbol_lib.symbols["AudioJack-CUI-SJ-3523-SMT"].name
         == "AudioJack-CUI-SJ-3523-SMT"
     )
 
 
-def test_parser_pcb_and_footprints():
-    pcb = C_kicad_pcb_file.loads(PCBFILE)
-    fp = C_kicad_footprint_file.loads(FPFILE)
-
+def test_parser_pcb_and_footprints(
+    pcb: C_kicad_pcb_file, footprint: C_kicad_footprint_file
+):
     assert [f.name for f in pcb.kicad_pcb.footprints] == [
         "logos:faebryk_logo",
         "lcsc:LED0603-RD-YELLOW",
@@ -99,7 +134,7 @@ def test_parser_pcb_and_footprints():
     assert not pcb.kicad_pcb.setup.pcbplotparams.usegerberextensions
 
     padtype = pcb.C_kicad_pcb.C_pcb_footprint.C_pad.E_type
-    assert [(p.name, p.type) for p in fp.footprint.pads] == [
+    assert [(p.name, p.type) for p in footprint.footprint.pads] == [
         ("", padtype.smd),
         ("", padtype.smd),
         ("1", padtype.smd),
@@ -110,8 +145,8 @@ def test_parser_pcb_and_footprints():
     assert C_footprint.E_attr.exclude_from_bom in logo_fp.attr
 
 
-def test_write():
-    pcb = C_kicad_pcb_file.loads(PCBFILE)
+def test_write(pcb: C_kicad_pcb_file):
+    pcb = deepcopy(pcb)
 
     def _d1(pcb: C_kicad_pcb_file):
         return find(
@@ -127,8 +162,8 @@ def test_write():
     assert _d1(pcb_reload).propertys["Value"].value == "LED2"
 
 
-def test_empty_enum_positional():
-    pcb = C_kicad_pcb_file.loads(PCBFILE)
+def test_empty_enum_positional(pcb: C_kicad_pcb_file):
+    pcb = deepcopy(pcb)
 
     def _b1_p1(pcb: C_kicad_pcb_file):
         return find(
@@ -143,19 +178,15 @@ def test_empty_enum_positional():
         C_footprint.C_pad.C_drill.E_shape.stadium, 0.5, 0.4
     )
 
-    def _effects(pcb: C_kicad_pcb_file):
-        return (
-            find(pcb.kicad_pcb.footprints, lambda f: f.name == "logos:faebryk_logo")
-            .propertys["Datasheet"]
-            .effects
-        )
-
-    _effects(pcb).justifys.append(
-        C_effects.C_justify([C_effects.C_justify.E_justify.center_horizontal])
+    effects = (
+        find(pcb.kicad_pcb.footprints, lambda f: f.name == "logos:faebryk_logo")
+        .propertys["Datasheet"]
+        .effects
     )
-    _effects(pcb).justifys.append(
-        C_effects.C_justify([C_effects.C_justify.E_justify.top])
+    effects.justifys.append(
+        C_effects.C_justify([C_effects.C_justify.E_justify.center_horizontal])
     )
+    effects.justifys.append(C_effects.C_justify([C_effects.C_justify.E_justify.top]))
 
     pcb_reload = C_kicad_pcb_file.loads(pcb.dumps())
 
@@ -165,43 +196,49 @@ def test_empty_enum_positional():
     )
 
     # empty center string ignored
-    assert _effects(pcb).get_justifys() == [
+    assert effects.get_justifys() == [
         C_effects.C_justify.E_justify.center_horizontal,
         C_effects.C_justify.E_justify.top,
     ]
 
 
 @pytest.mark.parametrize(
-    ("parser", "path"),
+    ("parser", "path", "fixture"),
     [
-        (C_kicad_pcb_file, PCBFILE),
-        (C_kicad_footprint_file, FPFILE),
-        (C_kicad_netlist_file, NETFILE),
-        (C_kicad_project_file, PRJFILE),
-        (C_kicad_fp_lib_table_file, FPLIBFILE),
-        (C_kicad_sch_file, SCHFILE),
-        (C_kicad_sym_file, SYMFILE),
+        (C_kicad_pcb_file, PCBFILE, "pcb"),
+        (C_kicad_footprint_file, FPFILE, "footprint"),
+        (C_kicad_netlist_file, NETFILE, "netlist"),
+        (C_kicad_project_file, PRJFILE, "project"),
+        (C_kicad_fp_lib_table_file, FPLIBFILE, "fp_lib_table"),
+        (C_kicad_sch_file, SCHFILE, "schematic"),
+        (C_kicad_sym_file, SYMFILE, "symbols"),
     ],
 )
-def test_dump_load_equality(parser: type[SEXP_File | JSON_File], path: Path):
-    loaded = parser.loads(path)
+def test_dump_load_equality(
+    parser: type[SEXP_File | JSON_File],
+    path: Path,
+    fixture: str,
+    request: pytest.FixtureRequest,
+):
+    loaded = request.getfixturevalue(fixture)
     dump = loaded.dumps(Path("/tmp") / path.name if DUMP else None)
     loaded_dump = parser.loads(dump)
     dump2 = loaded_dump.dumps()
     assert dump == dump2
 
 
-@pytest.mark.parametrize(
-    "fp_path", _FP_DIR(5).glob("*.kicad_mod"), ids=lambda p: p.stem
-)
+# Sorted, so every xdist worker collects the same test order
+_V5_FPS = sorted(_FP_DIR(5).glob("*.kicad_mod"))
+_V6_FPS = sorted(_FP_DIR(6).glob("*.kicad_mod"))
+
+
+@pytest.mark.parametrize("fp_path", _V5_FPS, ids=lambda p: p.stem)
 def test_v5_fp_convert(fp_path: Path):
     fp = kicad_footprint_file(fp_path)
     assert fp.footprint.name.split(":")[-1] == fp_path.stem
 
 
-@pytest.mark.parametrize(
-    "fp_path", _FP_DIR(6).glob("*.kicad_mod"), ids=lambda p: p.stem
-)
+@pytest.mark.parametrize("fp_path", _V6_FPS, ids=lambda p: p.stem)
 def test_v6_fp_convert(fp_path: Path):
     fp = kicad_footprint_file(fp_path)
     assert fp.footprint.name.split(":")[-1] == fp_path.stem
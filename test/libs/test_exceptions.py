@@ -1,3 +1,4 @@
+import logging
 from unittest.mock import MagicMock
 
 import pytest
@@ -54,6 +55,17 @@ def test_downgrade_context():
     logger.log.assert_called_once()
 
 
+def test_downgrade_is_silent():
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.INFO)
+
+    assert downgrade(ValueError, to_level=logging.DEBUG, logger=logger).is_silent
+    assert not downgrade(ValueError, to_level=logging.INFO, logger=logger).is_silent
+    assert not downgrade(
+        ValueError, to_level=logging.DEBUG, raise_anyway=True, logger=logger
+    ).is_silent
+
+
 def test_downgrade_context_custom_exception():
     logger = MagicMock()
 
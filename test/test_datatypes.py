@@ -1,4 +1,12 @@
-from atopile.datatypes import KeyOptItem, KeyOptMap, StackList, TypeRef
+import pytest
+
+from atopile.datatypes import (
+    KeyOptItem,
+    KeyOptMap,
+    ReferencePartType,
+    StackList,
+    TypeRef,
+)
 
 
 def test_ref_from_one():
@@ -27,6 +35,23 @@ def test_keyoptitem_ref():
     assert KeyOptItem((TypeRef.from_one("foo"), "bar")).ref == ("foo",)
 
 
+def test_reference_part_type_eq():
+    assert ReferencePartType("foo") == ReferencePartType("foo")
+    assert ReferencePartType("foo", 1) == ReferencePartType("foo", 1)
+    assert ReferencePartType("foo", 1) != ReferencePartType("foo", 2)
+    assert ReferencePartType("foo") != ReferencePartType("bar")
+    assert len({ReferencePartType("foo", "a"), ReferencePartType("foo", "a")}) == 1
+
+
+def test_reference_part_type_immutable():
+    ref = ReferencePartType("foo", 1)
+    with pytest.raises(AttributeError):
+        ref.name = "bar"  # type: ignore
+    with pytest.raises(AttributeError):
+        ref.key = 2  # type: ignore
+    assert ref == ReferencePartType("foo", 1)
+
+
 def test_stack_list():
     stack = StackList()
     with stack.enter(1):
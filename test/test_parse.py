@@ -1,8 +1,17 @@
+import os
 import textwrap
+from pathlib import Path
 
 import pytest
+from antlr4 import InputStream
+from antlr4.atn.PredictionMode import PredictionMode
 
-from atopile.parse import UserSyntaxError, parse_text_as_file
+from atopile.parse import (
+    FileParser,
+    UserSyntaxError,
+    make_parser,
+    parse_text_as_file,
+)
 
 
 def test_syntax_error():
@@ -14,3 +23,80 @@ def test_syntax_error():
         parse_text_as_file(src)
 
     assert exc_info.value.origin_start is not None
+
+
+def test_syntax_error_reported_from_ll_pass():
+    # SLL prediction fails here with "no viable alternative" at the first `=`;
+    # the error should come from the LL re-parse instead
+    with pytest.raises(UserSyntaxError) as exc_info:
+        parse_text_as_file("module A:\n    x = = 1\n")
+
+    assert "extraneous input '='" in exc_info.value.message
+    origin = exc_info.value.origin_start
+    assert origin is not None
+    assert (origin.line, origin.column) == (2, 8)
+
+
+def test_two_stage_parse_matches_ll():
+    src = textwrap.dedent("""
+    import Resistor
+
+    module A:
+        r = new Resistor
+        r.resistance = 10kohm +/- 5%
+        x = (1 + 2) * 3 ** 2
+        signal a ~ r.unnamed[0]
+    """)
+
+    tree = parse_text_as_file(src)
+
+    ll_parser = make_parser(InputStream(src))
+    ll_parser._interp.predictionMode = PredictionMode.LL
+    ll_tree = ll_parser.file_input()
+
+    assert tree.toStringTree(recog=ll_parser) == ll_tree.toStringTree(
+        recog=ll_parser
+    )
+
+
+def test_file_parser_cache(tmp_path: Path):
+    path = tmp_path / "a.ato"
+    path.write_text("module A:\n    pass\n")
+
+    file_parser = FileParser()
+    tree = file_parser.get_ast_from_file(path)
+    assert file_parser.get_ast_from_file(path) is tree
+
+    # Different length too, so this doesn't rely on the mtime changing
+    path.write_text("module Bc:\n    pass\n")
+    assert file_parser.get_ast_from_file(path) is not tree
+
+
+def test_file_parser_cache_stat_hit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "a.ato"
+    path.write_text("module A:\n    pass\n")
+    # Old enough to be outside the racy window, so the stat is trusted
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+    file_parser = FileParser()
+    tree = file_parser.get_ast_from_file(path)
+
+    def _no_read(self):
+        raise AssertionError("file was re-read despite an unchanged stat")
+
+    monkeypatch.setattr(Path, "read_bytes", _no_read)
+    assert file_parser.get_ast_from_file(path) is tree
+
+
+def test_file_parser_cache_racy_stat(tmp_path: Path):
+    path = tmp_path / "a.ato"
+    path.write_text("module A:\n    pass\n")
+    mtime_ns = path.stat().st_mtime_ns
+
+    file_parser = FileParser()
+    tree = file_parser.get_ast_from_file(path)
+
+    # Same size and mtime, as if rewritten within a single timestamp tick
+    path.write_text("module B:\n    pass\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    assert file_parser.get_ast_from_file(path) is not tree